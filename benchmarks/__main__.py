@@ -0,0 +1,93 @@
+"""
+Benchmarks of the service layer and auth hot paths.
+
+Runs the app in-process over an ASGI transport against the database in
+.env, so point POSTGRES_* at a disposable database. Results are written
+as JSON; with --baseline, any result worse than its baseline by more
+than --tolerance makes the run fail.
+
+Usage:
+    python -m benchmarks [--suite jwt auth list search upload] [--quick]
+        [--output bench.json] [--baseline baseline.json] [--tolerance 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+
+# admission control would reject the repeated logins; metrics,
+# profiling and logging stay at their defaults
+os.environ.setdefault("LOGIN_EMAIL_RATE", "1000000")
+os.environ.setdefault("LOGIN_EMAIL_BURST", "1000000")
+os.environ.setdefault("AUTH_IP_RATE", "1000000")
+os.environ.setdefault("AUTH_IP_BURST", "1000000")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from benchmarks.harness import as_dicts, bench_client, compare  # noqa: E402
+from benchmarks.suites import SUITES  # noqa: E402
+
+
+async def run(suites: list[str], quick: bool) -> list[dict]:
+    results = []
+    async with bench_client() as (client, user):
+        for name in suites:
+            for result in await SUITES[name](client, user, quick):
+                print(
+                    f"{result.name:<28} {result.value:>12.2f} {result.unit:<6}"
+                    f" median {result.median_ms:.3f} ms"
+                    f" p95 {result.p95_ms:.3f} ms"
+                )
+                results.append(result)
+    return as_dicts(results)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--suite", nargs="+", choices=list(SUITES), default=list(SUITES)
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="fewer sizes and iterations"
+    )
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed slowdown against the baseline, as a fraction",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.suite, args.quick))
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cpus": os.cpu_count(),
+                "quick": args.quick,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    for name, before, after, change in regressions:
+        print(
+            f"REGRESSION {name}: {before:.2f} -> {after:.2f} ({change:+.0%})"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
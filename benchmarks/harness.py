@@ -0,0 +1,169 @@
+import statistics
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Awaitable, Callable
+
+import httpx
+
+from src.audio.schemas import FileBulkDeleteSchema
+from src.audio.service import AudiFileService
+from src.infra.db_accessor import db_config
+from src.main import app
+from src.users.models import Roles
+from src.users.schemas import UserCreateSchema
+from src.users.service import UserService
+
+BENCH_PASSWORD = "bench-password"
+
+
+@dataclass
+class Result:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+    samples: int
+    median_ms: float
+    p95_ms: float
+
+
+@dataclass
+class BenchUser:
+    id: int
+    email: str
+    username: str
+    token: str
+
+
+async def measure(
+    name: str,
+    func: Callable[[], Awaitable[None]],
+    iterations: int,
+    warmup: int = 1,
+    work: float = 1,
+    unit: str = "ops/s",
+) -> Result:
+    """
+    Awaits ``func`` ``iterations`` times after ``warmup`` calls. The value
+    is ``work`` units (operations, megabytes, ...) per second of median
+    call time.
+    """
+    for _ in range(warmup):
+        await func()
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await func()
+        durations.append(time.perf_counter() - started)
+    durations.sort()
+    median = statistics.median(durations)
+    p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+    return Result(
+        name=name,
+        value=work / median,
+        unit=unit,
+        higher_is_better=True,
+        samples=iterations,
+        median_ms=median * 1000,
+        p95_ms=p95 * 1000,
+    )
+
+
+def measure_sync(
+    name: str, func: Callable[[], object], iterations: int
+) -> Result:
+    """Like measure for cheap synchronous calls, timed in one loop."""
+    func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = (time.perf_counter() - started) / iterations
+    return Result(
+        name=name,
+        value=1 / elapsed,
+        unit="ops/s",
+        higher_is_better=True,
+        samples=iterations,
+        median_ms=elapsed * 1000,
+        p95_ms=elapsed * 1000,
+    )
+
+
+@asynccontextmanager
+async def bench_client() -> AsyncIterator[tuple[httpx.AsyncClient, BenchUser]]:
+    """
+    Runs the app in-process (lifespan included) behind an ASGI transport
+    and yields a client logged in as a throwaway user. The user and its
+    files are deleted on exit; their blobs are left to the collector.
+    """
+    suffix = uuid.uuid4().hex[:12]
+    async with app.router.lifespan_context(app):
+        async with db_config.AsyncSession_() as session:
+            created = await UserService(db_session=session).create_user(
+                UserCreateSchema(
+                    email=f"bench-{suffix}@example.com",
+                    username=f"bench-{suffix}",
+                    password=BENCH_PASSWORD,
+                    first_name="Bench",
+                    last_name="User",
+                    role=Roles.SIMPLE_USER,
+                )
+            )
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            response = await client.post(
+                "/auth/token",
+                json={
+                    "email": created.email,
+                    "username": created.username,
+                    "password": BENCH_PASSWORD,
+                },
+            )
+            response.raise_for_status()
+            token = response.json()["access_token"]
+            client.headers["Authorization"] = f"Bearer {token}"
+            user = BenchUser(
+                created.id, created.email, created.username, token
+            )
+            try:
+                yield client, user
+            finally:
+                await cleanup(user.id)
+
+
+async def cleanup(user_id: int) -> None:
+    async with db_config.AsyncSession_() as session:
+        user_service = UserService(db_session=session)
+        await AudiFileService(
+            db_session=session, user_service=user_service
+        ).delete_files(FileBulkDeleteSchema(owner_id=user_id))
+        await user_service.delete_user(user_id)
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float):
+    """
+    Returns (name, baseline value, value, change) for every result worse
+    than its baseline by more than ``tolerance`` (a fraction).
+    """
+    previous = {result["name"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get(result["name"])
+        if base is None or not base["value"]:
+            continue
+        change = result["value"] / base["value"] - 1
+        if not result["higher_is_better"]:
+            change = -change
+        if change < -tolerance:
+            regressions.append(
+                (result["name"], base["value"], result["value"], change)
+            )
+    return regressions
+
+
+def as_dicts(results: list[Result]) -> list[dict]:
+    return [asdict(result) for result in results]
@@ -0,0 +1,207 @@
+"""
+Memory harness for concurrent uploads.
+
+Drives N concurrent uploads of a given size through POST /audios/ per
+scenario and records the peak RSS growth and event loop lag. A second
+pass of the same uploads runs under tracemalloc, which slows allocation
+down and adds memory of its own, and records the peak of traced memory
+with the lines holding the most of it afterwards. Fails if the peak RSS
+growth per in-flight upload of the first pass exceeds --budget-mb.
+
+Uses the database from .env, like the benchmarks; point POSTGRES_* at a
+disposable database.
+
+Usage:
+    python -m benchmarks.memory [--scenario 16x8MiB 4x64MiB]
+        [--budget-mb 8] [--output memory.json] [--no-tracemalloc]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# repeated uploads must not be throttled or logged at INFO
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from benchmarks.harness import bench_client  # noqa: E402
+from benchmarks.suites import wav_bytes  # noqa: E402
+
+MB = 1024 * 1024
+UNITS = {"KiB": 1024, "MiB": MB, "GiB": 1024 * MB}
+SAMPLE_INTERVAL = 0.005
+LAG_INTERVAL = 0.01
+
+
+def parse_scenario(value: str) -> tuple[int, int]:
+    match = re.fullmatch(r"(\d+)x(\d+)(KiB|MiB|GiB)", value)
+    if not match:
+        raise argparse.ArgumentTypeError(
+            f"expected <count>x<size><KiB|MiB|GiB>, got {value!r}"
+        )
+    count, size, unit = match.groups()
+    return int(count), int(size) * UNITS[unit]
+
+
+def rss() -> int:
+    """Current resident set size in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # no procfs: the lifetime peak is the best available figure
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RssSampler(threading.Thread):
+    """Samples RSS in the background and keeps the peak."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = rss()
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(SAMPLE_INTERVAL):
+            self.peak = max(self.peak, rss())
+
+    def stop(self) -> int:
+        self._done.set()
+        self.join()
+        return max(self.peak, rss())
+
+
+async def watch_loop_lag(lags: list[float]) -> None:
+    """Records how late the event loop wakes up from short sleeps."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(max(0.0, loop.time() - started - LAG_INTERVAL))
+
+
+def upload_all(client, count: int, path: str):
+    """Uploads the file at ``path`` ``count`` times concurrently."""
+
+    async def upload() -> None:
+        with open(path, "rb") as f:
+            response = await client.post(
+                "/audios/",
+                data={"filename": "memory", "description": "memory"},
+                files={"file": ("memory.wav", f, "audio/wav")},
+            )
+        response.raise_for_status()
+
+    return asyncio.gather(*(upload() for _ in range(count)))
+
+
+async def measure_uploads(client, count: int, size: int, path: str) -> dict:
+    baseline = rss()
+    sampler = RssSampler()
+    sampler.start()
+    lags: list[float] = []
+    lag_task = asyncio.create_task(watch_loop_lag(lags))
+    started = time.perf_counter()
+    try:
+        await upload_all(client, count, path)
+    finally:
+        elapsed = time.perf_counter() - started
+        lag_task.cancel()
+        peak = sampler.stop()
+    return {
+        "uploads": count,
+        "size": size,
+        "seconds": elapsed,
+        "rss_before_mb": baseline / MB,
+        "rss_peak_mb": peak / MB,
+        "rss_growth_per_upload_mb": (peak - baseline) / MB / count,
+        "loop_lag_max_ms": max(lags, default=0) * 1000,
+        "loop_lag_p99_ms": (
+            sorted(lags)[int(len(lags) * 0.99)] * 1000 if lags else 0
+        ),
+    }
+
+
+async def trace_uploads(client, count: int, path: str) -> dict:
+    tracemalloc.start(10)
+    try:
+        await upload_all(client, count, path)
+        snapshot = tracemalloc.take_snapshot()
+        _, traced_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "traced_peak_mb": traced_peak / MB,
+        "top_allocators": [
+            {"where": str(stat.traceback[0]), "kib": stat.size / 1024}
+            for stat in snapshot.statistics("lineno")[:10]
+        ],
+    }
+
+
+async def run(scenarios, budget_mb: float, trace: bool) -> list[dict]:
+    results = []
+    async with bench_client() as (client, _):
+        for count, size in scenarios:
+            with tempfile.NamedTemporaryFile(suffix=".wav") as source:
+                source.write(wav_bytes(size))
+                source.flush()
+                result = await measure_uploads(
+                    client, count, size, source.name
+                )
+                if trace:
+                    result.update(
+                        await trace_uploads(client, count, source.name)
+                    )
+            result["budget_mb"] = budget_mb
+            result["ok"] = result["rss_growth_per_upload_mb"] <= budget_mb
+            print(
+                f"{count}x{size / MB:g}MiB: "
+                f"{result['rss_growth_per_upload_mb']:.2f} MB/upload "
+                f"(peak RSS {result['rss_peak_mb']:.0f} MB), "
+                f"loop lag max {result['loop_lag_max_ms']:.1f} ms"
+                + ("" if result["ok"] else " OVER BUDGET")
+            )
+            results.append(result)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--scenario",
+        nargs="+",
+        type=parse_scenario,
+        default=[parse_scenario("16x8MiB"), parse_scenario("4x64MiB")],
+    )
+    parser.add_argument(
+        "--budget-mb",
+        type=float,
+        default=8,
+        help="max peak RSS growth per in-flight upload",
+    )
+    parser.add_argument("--output", default="memory.json")
+    parser.add_argument(
+        "--no-tracemalloc",
+        action="store_true",
+        help="skip the second pass of each scenario under tracemalloc",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run(args.scenario, args.budget_mb, not args.no_tracemalloc)
+    )
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+import itertools
+import os
+import struct
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import func, insert, select
+
+from benchmarks.harness import (
+    BENCH_PASSWORD,
+    BenchUser,
+    Result,
+    measure,
+    measure_sync,
+)
+from src.audio.models import AudioFile
+from src.auth.service import AuthService
+from src.auth.tokens import decode_access_token, token_cache
+from src.infra.db_accessor import db_config
+from src.users.models import Roles
+
+MB = 1024 * 1024
+WAV_HEADER_SIZE = 44
+# bytes of a benchmark upload that make it unique: its first samples
+UPLOAD_STAMP = slice(WAV_HEADER_SIZE, WAV_HEADER_SIZE + 8)
+
+
+def wav_bytes(size: int) -> bytes:
+    """A 16-bit stereo 44.1 kHz WAV of ``size`` bytes of random samples."""
+    data_size = size - WAV_HEADER_SIZE
+    header = b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE"
+    header += b"fmt " + struct.pack("<IHHIIHH", 16, 1, 2, 44100, 176400, 4, 16)
+    header += b"data" + struct.pack("<I", data_size)
+    return header + os.urandom(data_size)
+
+
+async def bench_upload(
+    client: httpx.AsyncClient, user: BenchUser, quick: bool
+) -> list[Result]:
+    """
+    Upload throughput by file size. Each upload has new content, so it
+    always stores a new blob. The ASGI transport returns after background
+    tasks, so timings include computing the waveform peaks.
+
+    Payloads are generated before timing starts; each upload only stamps
+    its number over the first samples.
+    """
+    results = []
+    sizes = [64 * 1024, MB, 16 * MB]
+    for size in sizes[:2] if quick else sizes:
+        payload = bytearray(wav_bytes(size))
+        uploads = itertools.count()
+
+        async def upload():
+            payload[UPLOAD_STAMP] = next(uploads).to_bytes(8, "little")
+            response = await client.post(
+                "/audios/",
+                data={"filename": "bench", "description": "benchmark"},
+                files={"file": ("bench.wav", bytes(payload), "audio/wav")},
+            )
+            response.raise_for_status()
+
+        label = f"{size // 1024}KiB" if size < MB else f"{size // MB}MiB"
+        results.append(
+            await measure(
+                f"upload.{label}",
+                upload,
+                iterations=3 if size >= 16 * MB else 10,
+                work=size / MB,
+                unit="MB/s",
+            )
+        )
+    return results
+
+
+async def _catalog_size(user_id: int) -> int:
+    async with db_config.AsyncSession_() as session:
+        return await session.scalar(
+            select(func.count(AudioFile.id)).where(
+                AudioFile.owner_id == user_id
+            )
+        )
+
+
+async def _fill_catalog(user_id: int, count: int, start: int = 0) -> None:
+    """Adds files ``track-<start>`` to ``track-<start + count - 1>``."""
+    created_at = datetime(2025, 1, 1)
+    rows = [
+        {
+            "filename": f"track-{index:06d}",
+            "filepath": "/dev/null",
+            "description": "benchmark",
+            "extension": "wav",
+            "duration": float(index % 600),
+            "owner_id": user_id,
+            "created_at": created_at + timedelta(seconds=index),
+        }
+        for index in range(start, start + count)
+    ]
+    async with db_config.AsyncSession_() as session:
+        await session.execute(insert(AudioFile), rows)
+        await session.commit()
+
+
+def _page_limits(total: int, page_size: int) -> list[int]:
+    limits = [page_size] * (total // page_size)
+    return limits + [total % page_size] if total % page_size else limits
+
+
+async def bench_list(
+    client: httpx.AsyncClient, user: BenchUser, quick: bool
+) -> list[Result]:
+    """Latency of the first and of a deep page by catalog size."""
+    results = []
+    total = await _catalog_size(user.id)
+    sizes = [100, 1_000, 10_000]
+    for size in sizes[:2] if quick else sizes:
+        if size > total:
+            await _fill_catalog(user.id, size - total, start=total)
+            total = size
+        url = f"/audios/{user.id}/files"
+
+        async def first_page():
+            response = await client.get(url, params={"limit": 50})
+            response.raise_for_status()
+
+        results.append(
+            await measure(f"list.first_page.{size}", first_page, 20)
+        )
+
+        # cursor of a page 90% of the way through the catalog
+        cursor = None
+        for limit in _page_limits(size * 9 // 10, 500):
+            response = await client.get(
+                url, params={"limit": limit, "cursor": cursor}
+            )
+            cursor = response.json()["next_cursor"]
+
+        async def deep_page():
+            response = await client.get(
+                url, params={"limit": 50, "cursor": cursor}
+            )
+            response.raise_for_status()
+
+        results.append(await measure(f"list.deep_page.{size}", deep_page, 20))
+    return results
+
+
+async def bench_search(
+    client: httpx.AsyncClient, user: BenchUser, quick: bool
+) -> list[Result]:
+    """
+    Search latency by catalog size, for a term matching one file and for
+    one matching every file (all of them are ranked).
+    """
+    results = []
+    total = await _catalog_size(user.id)
+    sizes = [1_000, 10_000, 100_000]
+    for size in sizes[:2] if quick else sizes:
+        if size > total:
+            await _fill_catalog(user.id, size - total, start=total)
+            total = size
+
+        for label, query in (("one", f"{size // 2:06d}"), ("all", "track")):
+
+            async def search():
+                response = await client.get(
+                    "/audios/search", params={"q": query, "limit": 20}
+                )
+                response.raise_for_status()
+
+            results.append(await measure(f"search.{label}.{size}", search, 20))
+    return results
+
+
+async def bench_auth(
+    client: httpx.AsyncClient, user: BenchUser, quick: bool
+) -> list[Result]:
+    """Password logins and authenticated requests per second."""
+
+    async def login():
+        response = await client.post(
+            "/auth/token",
+            json={
+                "email": user.email,
+                "username": user.username,
+                "password": BENCH_PASSWORD,
+            },
+        )
+        response.raise_for_status()
+
+    async def me():
+        response = await client.get("/auth/me")
+        response.raise_for_status()
+
+    return [
+        await measure("auth.login", login, 3 if quick else 10),
+        await measure("auth.me", me, 50 if quick else 200),
+    ]
+
+
+async def bench_jwt(
+    client: httpx.AsyncClient, user: BenchUser, quick: bool
+) -> list[Result]:
+    """Cost of signing and verifying access tokens, with and without cache."""
+    auth_service = AuthService(
+        yandex_client=None, db_session=None, user_service=None
+    )
+    iterations = 1_000 if quick else 10_000
+
+    def generate():
+        return auth_service.generate_access_token(
+            user.email,
+            user.id,
+            user.username,
+            Roles.SIMPLE_USER,
+            timedelta(minutes=10),
+        )
+
+    def verify_uncached():
+        token_cache.clear()
+        decode_access_token(user.token)
+
+    def verify_cached():
+        decode_access_token(user.token)
+
+    return [
+        measure_sync("jwt.generate", generate, iterations),
+        measure_sync("jwt.verify", verify_uncached, iterations),
+        measure_sync("jwt.verify_cached", verify_cached, iterations),
+    ]
+
+
+SUITES = {
+    "jwt": bench_jwt,
+    "auth": bench_auth,
+    "list": bench_list,
+    "search": bench_search,
+    "upload": bench_upload,
+}
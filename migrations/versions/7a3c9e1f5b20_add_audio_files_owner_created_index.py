@@ -0,0 +1,42 @@
+"""add AudioFile -> (owner_id, created_at, id) index
+
+Revision ID: 7a3c9e1f5b20
+Revises: 5e2d7f4a8c91
+Create Date: 2025-04-14 11:05:12.402931
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a3c9e1f5b20"
+down_revision: Union[str, None] = "5e2d7f4a8c91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # built concurrently so audio_files stays writable on large installs
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_audio_files_owner_id_created_at_id",
+            "audio_files",
+            ["owner_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_audio_files_owner_id_created_at_id",
+            table_name="audio_files",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
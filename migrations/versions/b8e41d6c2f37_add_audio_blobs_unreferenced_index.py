@@ -0,0 +1,43 @@
+"""add AudioBlob -> partial index on unreferenced blobs
+
+Revision ID: b8e41d6c2f37
+Revises: 7a3c9e1f5b20
+Create Date: 2025-04-15 14:42:08.917354
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e41d6c2f37"
+down_revision: Union[str, None] = "7a3c9e1f5b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_audio_blobs_unreferenced",
+            "audio_blobs",
+            ["id"],
+            unique=False,
+            postgresql_where=sa.text("refcount <= 0"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_audio_blobs_unreferenced",
+            table_name="audio_blobs",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,118 @@
+"""add AudioFile -> full-text search vector and GIN index
+
+Revision ID: d93a7c5e1b48
+Revises: b8e41d6c2f37
+Create Date: 2025-04-17 10:21:44.306518
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d93a7c5e1b48"
+down_revision: Union[str, None] = "b8e41d6c2f37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # a plain nullable column only changes the catalog, where a stored
+    # generated column would rewrite the table under an exclusive lock;
+    # a trigger keeps it up to date instead
+    op.add_column(
+        "audio_files",
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+    # filename words split on -_. (the parser reads "-01" as a number);
+    # descriptions are cut to keep the vector under the 1 MB limit
+    op.execute(
+        """
+        CREATE FUNCTION audio_files_search_vector(
+            filename text, description text
+        ) RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+            SELECT setweight(
+                to_tsvector('simple', translate(filename, '-_.', '   ')), 'A'
+            ) || setweight(
+                to_tsvector(
+                    'simple', left(coalesce(description, ''), 100000)
+                ),
+                'B'
+            )
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION audio_files_search_vector_trigger()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := audio_files_search_vector(
+                NEW.filename, NEW.description
+            );
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER audio_files_search_vector
+        BEFORE INSERT OR UPDATE OF filename, description ON audio_files
+        FOR EACH ROW EXECUTE FUNCTION audio_files_search_vector_trigger()
+        """
+    )
+    with op.get_context().autocommit_block():
+        # existing rows in short transactions, each locking one batch
+        connection = op.get_bind()
+        last_id = 0
+        while True:
+            upper_id = connection.scalar(
+                sa.text(
+                    "SELECT max(id) FROM (SELECT id FROM audio_files "
+                    "WHERE id > :last_id ORDER BY id LIMIT :batch_size) AS b"
+                ),
+                {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+            )
+            if upper_id is None:
+                break
+            connection.execute(
+                sa.text(
+                    "UPDATE audio_files SET search_vector = "
+                    "audio_files_search_vector(filename, description) "
+                    "WHERE id > :last_id AND id <= :upper_id "
+                    "AND search_vector IS NULL"
+                ),
+                {"last_id": last_id, "upper_id": upper_id},
+            )
+            last_id = upper_id
+        op.create_index(
+            "ix_audio_files_search_vector",
+            "audio_files",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_audio_files_search_vector",
+            table_name="audio_files",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute("DROP TRIGGER audio_files_search_vector ON audio_files")
+    op.execute("DROP FUNCTION audio_files_search_vector_trigger()")
+    op.execute("DROP FUNCTION audio_files_search_vector(text, text)")
+    op.drop_column("audio_files", "search_vector")
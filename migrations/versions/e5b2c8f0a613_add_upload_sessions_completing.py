@@ -0,0 +1,36 @@
+"""add UploadSession -> completing flag
+
+Revision ID: e5b2c8f0a613
+Revises: d93a7c5e1b48
+Create Date: 2025-04-18 09:12:37.550218
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b2c8f0a613"
+down_revision: Union[str, None] = "d93a7c5e1b48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "upload_sessions",
+        sa.Column(
+            "completing",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("upload_sessions", "completing")
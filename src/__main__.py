@@ -0,0 +1,91 @@
+"""
+Serves the API with uvicorn.
+
+Runs WEB_CONCURRENCY worker processes on one listening socket. Workers
+are fresh interpreters: each loads the settings and runs the lifespan
+(warm-up, superuser bootstrap) on its own, so DB pools, thread and
+process pools and in-process caches are per worker. SIGHUP restarts the
+workers one at a time, SIGTTIN and SIGTTOU add and remove one.
+
+Usage:
+    python -m src [--workers 4] [--host 0.0.0.0] [--port 8100] [--reload]
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+
+import uvicorn
+
+from src.logging_ import configure_logging
+from src.settings import settings
+
+
+def _prepare_metrics_directory() -> str | None:
+    """
+    Points PROMETHEUS_MULTIPROC_DIR at an empty directory shared by the
+    workers. Returns the directory if it was created here.
+    """
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        # samples of a previous run would be added to the new ones
+        for path in glob.glob(os.path.join(directory, "*.db")):
+            os.remove(path)
+        return None
+    directory = tempfile.mkdtemp(prefix="audio_manager-metrics-")
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+    return directory
+
+
+def serve(host: str, port: int, workers: int, reload: bool) -> None:
+    created_directory = None
+    if workers > 1 and not reload and settings.METRICS_ENABLED:
+        created_directory = _prepare_metrics_directory()
+    try:
+        uvicorn.run(
+            "src.main:app",
+            host=host,
+            port=port,
+            workers=1 if reload else workers,
+            reload=reload,
+            timeout_graceful_shutdown=(
+                settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS
+            ),
+            timeout_keep_alive=settings.SERVER_KEEP_ALIVE_SECONDS,
+            limit_max_requests=settings.SERVER_MAX_REQUESTS,
+            proxy_headers=True,
+            forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,
+            # uvicorn's records go through the root logger, see logging_
+            log_config=None,
+        )
+    finally:
+        if created_directory:
+            shutil.rmtree(created_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.WEB_CONCURRENCY,
+        help="worker processes, about one per core",
+    )
+    parser.add_argument(
+        "--reload",
+        action="store_true",
+        default=settings.SERVER_RELOAD,
+        help="restart on code changes (development, single worker)",
+    )
+    args = parser.parse_args()
+    configure_logging()
+    serve(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        reload=args.reload,
+    )
@@ -1,14 +1,46 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import RedirectResponse
 from pydantic import ValidationError
 
-from src.audio.schemas import FileCreateSchema, FileResponseSchema
-from src.audio.service import AudiFileService
+from src.audio.responses import AudioFileResponse, audio_file_response
+from src.audio.schemas import (
+    BatchUploadSchema,
+    FileBulkDeleteResultSchema,
+    FileBulkDeleteSchema,
+    FileCreateSchema,
+    FileFilterSchema,
+    FilePageSchema,
+    FileResponseSchema,
+    FileSearchPageSchema,
+    FileSearchSchema,
+    UploadChunkSchema,
+    UploadSessionCreateSchema,
+    UploadSessionSchema,
+)
+from src.audio.service import AudiFileService, UploadSessionService
+from src.audio.tasks import generate_peaks
 from src.auth.schemas import TokenData
-from src.dependencies import get_audio_service, get_current_user
+from src.dependencies import (
+    get_audio_service,
+    get_current_user,
+    get_upload_session_service,
+)
 from src.exceptions import FileNotSupported
 from src.permissions import roles_required
+from src.settings import settings
 from src.users.models import Roles
 
 router = APIRouter(
@@ -26,6 +58,7 @@ async def upload_audio(
     filename: Annotated[str, Form()],
     current_user: Annotated[TokenData, Depends(get_current_user)],
     description: Annotated[str, Form()],
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
 ):
     try:
@@ -39,20 +72,203 @@ async def upload_audio(
         # TODO: перенести в сервис
         raise FileNotSupported()
 
-    return await audio_service.upload_file(file_upload=file_data, file=file)
+    audio_file = await audio_service.upload_file(
+        file_upload=file_data, file=file
+    )
+    background_tasks.add_task(generate_peaks, audio_file.id)
+    return audio_file
+
+
+@router.post(
+    "/batch",
+    response_model=BatchUploadSchema,
+    status_code=status.HTTP_207_MULTI_STATUS,
+)
+async def upload_audio_batch(
+    audio_service: Annotated[AudiFileService, Depends(get_audio_service)],
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+    background_tasks: BackgroundTasks,
+    files: Annotated[list[UploadFile], File()],
+    description: Annotated[str, Form()] = "",
+):
+    batch = await audio_service.upload_batch(
+        owner_id=current_user.user_id, files=files, description=description
+    )
+    background_tasks.add_task(
+        generate_peaks,
+        *(result.file.id for result in batch.results if result.file),
+    )
+    return batch
+
+
+@router.post(
+    "/uploads",
+    response_model=UploadSessionSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_upload_session(
+    body: UploadSessionCreateSchema,
+    upload_service: Annotated[
+        UploadSessionService, Depends(get_upload_session_service)
+    ],
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+):
+    return await upload_service.create_session(current_user.user_id, body)
+
+
+@router.get("/uploads/{session_id}", response_model=UploadSessionSchema)
+async def get_upload_session(
+    session_id: str,
+    upload_service: Annotated[
+        UploadSessionService, Depends(get_upload_session_service)
+    ],
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+):
+    return await upload_service.get_session(session_id, current_user.user_id)
+
+
+@router.put(
+    "/uploads/{session_id}/chunks/{index}",
+    response_model=UploadChunkSchema,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/octet-stream": {
+                    "schema": {"type": "string", "format": "binary"}
+                }
+            },
+        }
+    },
+)
+async def upload_chunk(
+    session_id: str,
+    index: int,
+    request: Request,
+    upload_service: Annotated[
+        UploadSessionService, Depends(get_upload_session_service)
+    ],
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+):
+    return await upload_service.upload_chunk(
+        session_id=session_id,
+        owner_id=current_user.user_id,
+        index=index,
+        chunks=request.stream(),
+    )
+
+
+@router.post(
+    "/uploads/{session_id}/complete",
+    response_model=FileResponseSchema,
+    status_code=status.HTTP_201_CREATED,
+)
+async def complete_upload_session(
+    session_id: str,
+    upload_service: Annotated[
+        UploadSessionService, Depends(get_upload_session_service)
+    ],
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+    background_tasks: BackgroundTasks,
+):
+    audio_file = await upload_service.complete(
+        session_id, current_user.user_id
+    )
+    background_tasks.add_task(generate_peaks, audio_file.id)
+    return audio_file
+
+
+@router.delete("/uploads/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload_session(
+    session_id: str,
+    upload_service: Annotated[
+        UploadSessionService, Depends(get_upload_session_service)
+    ],
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+):
+    return await upload_service.abort(session_id, current_user.user_id)
+
+
+@router.get("/search", response_model=FileSearchPageSchema)
+async def search_audio(
+    audio_service: Annotated[AudiFileService, Depends(get_audio_service)],
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+    search: Annotated[FileSearchSchema, Query()],
+):
+    """
+    Searches the filenames and descriptions of the current user's files.
+    """
+    return await audio_service.search_files(current_user.user_id, search)
 
 
-@router.get("/{user_id}/files", response_model=list[FileResponseSchema])
+@router.get("/{user_id}/files", response_model=FilePageSchema)
 async def get_files_by_user_id(
     audio_service: Annotated[AudiFileService, Depends(get_audio_service)],
     user_id: int,
+    filters: Annotated[FileFilterSchema, Query()],
 ):
 
     return await audio_service.get_files_by_user(
         user_id=user_id,
+        filters=filters,
+    )
+
+
+@router.get("/{file_id}/content", response_class=AudioFileResponse)
+async def get_file_content(
+    audio_service: Annotated[AudiFileService, Depends(get_audio_service)],
+    file_id: int,
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+):
+    download = await audio_service.get_file_for_download(file_id, current_user)
+    if download.url:
+        return RedirectResponse(download.url)
+    return audio_file_response(
+        path=download.path,
+        filename=download.filename,
+        media_type=download.media_type,
+    )
+
+
+@router.get(
+    "/{file_id}/peaks",
+    response_class=Response,
+    responses={
+        200: {
+            "description": "Interleaved int8 (min, max) pairs, one pair "
+            "per point. Values are amplitudes scaled to -128..127.",
+            "content": {"application/octet-stream": {}},
+        }
+    },
+)
+async def get_file_peaks(
+    audio_service: Annotated[AudiFileService, Depends(get_audio_service)],
+    file_id: int,
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+    resolution: Annotated[
+        int, Query(ge=1, le=max(settings.PEAKS_RESOLUTIONS))
+    ] = 1024,
+):
+    peaks = await audio_service.get_peaks(file_id, current_user, resolution)
+    return Response(
+        content=peaks,
+        media_type="application/octet-stream",
+        headers={"Cache-Control": "private, max-age=86400"},
     )
 
 
+@router.post("/bulk-delete", response_model=FileBulkDeleteResultSchema)
+async def delete_files(
+    audio_service: Annotated[AudiFileService, Depends(get_audio_service)],
+    criteria: FileBulkDeleteSchema,
+    current_user: Annotated[
+        TokenData, Depends(roles_required(Roles.SUPERUSER))
+    ],
+):
+    deleted = await audio_service.delete_files(criteria)
+    return FileBulkDeleteResultSchema(deleted=deleted)
+
+
 @router.delete("/{file_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_file(
     audio_service: Annotated[AudiFileService, Depends(get_audio_service)],
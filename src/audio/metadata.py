@@ -0,0 +1,256 @@
+import logging
+import os
+import struct
+from dataclasses import asdict, dataclass
+
+from src.infra.processes import run_in_process
+
+logger = logging.getLogger(__name__)
+
+# Parsers only read container headers, never audio frames. They run in a
+# process pool and must stay importable without the rest of the app.
+
+# kbps by bitrate index, for (MPEG version, layer); MPEG 2.5 uses version 2
+# fmt: off
+MP3_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416,
+             448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320,
+             384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256,
+             320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224,
+             256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# fmt: on
+MP3_SAMPLE_RATES = {
+    1: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    2.5: (11025, 12000, 8000),
+}
+MP3_SEARCH_LIMIT = 64 * 1024
+OGG_TAIL_SIZE = 64 * 1024
+OPUS_SAMPLE_RATE = 48000
+
+
+@dataclass
+class AudioMetadata:
+    duration: float | None = None
+    bitrate: int | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+    size: int | None = None
+
+    def as_columns(self) -> dict:
+        return asdict(self)
+
+
+def _skip_id3v2(f) -> int:
+    """Returns the offset of the first byte after an ID3v2 tag."""
+    f.seek(0)
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in header[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _parse_wav(f, size: int) -> AudioMetadata:
+    header = f.read(12)
+    if header[:4] not in (b"RIFF", b"RF64") or header[8:12] != b"WAVE":
+        raise ValueError("not a RIFF/WAVE file")
+    metadata = AudioMetadata(size=size)
+    byte_rate = None
+    while chunk_header := f.read(8):
+        if len(chunk_header) < 8:
+            break
+        chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+        if chunk_id == b"fmt ":
+            fmt = f.read(16)
+            _, channels, sample_rate, byte_rate = struct.unpack(
+                "<HHII", fmt[:12]
+            )
+            metadata.channels = channels
+            metadata.sample_rate = sample_rate
+            metadata.bitrate = byte_rate * 8
+            f.seek(chunk_size - 16 + chunk_size % 2, os.SEEK_CUR)
+        elif chunk_id == b"data":
+            if chunk_size == 0xFFFFFFFF or chunk_size > size - f.tell():
+                # streamed or RF64 file: data runs to the end
+                chunk_size = size - f.tell()
+            if byte_rate:
+                metadata.duration = chunk_size / byte_rate
+            break
+        else:
+            f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+    return metadata
+
+
+def _parse_flac(f, size: int) -> AudioMetadata:
+    f.seek(_skip_id3v2(f))
+    if f.read(4) != b"fLaC":
+        raise ValueError("not a FLAC file")
+    block_header = f.read(4)
+    if block_header[0] & 0x7F != 0:
+        raise ValueError("STREAMINFO must be the first metadata block")
+    info = f.read(34)
+    # 20 bits sample rate, 3 bits channels - 1, 5 bits bps - 1,
+    # 36 bits total samples
+    packed = int.from_bytes(info[10:18], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    total_samples = packed & 0xFFFFFFFFF
+    metadata = AudioMetadata(
+        size=size, sample_rate=sample_rate, channels=channels
+    )
+    if sample_rate and total_samples:
+        metadata.duration = total_samples / sample_rate
+        metadata.bitrate = int(size * 8 / metadata.duration)
+    return metadata
+
+
+def _parse_mp3_header(header: bytes):
+    b1, b2, b3 = header[1], header[2], header[3]
+    version = {0: 2.5, 2: 2, 3: 1}.get((b1 >> 3) & 0x3)
+    layer = {1: 3, 2: 2, 3: 1}.get((b1 >> 1) & 0x3)
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0x3
+    if (
+        version is None
+        or layer is None
+        or bitrate_index in (0, 15)
+        or sample_rate_index == 3
+    ):
+        return None
+    bitrate = MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index]
+    sample_rate = MP3_SAMPLE_RATES[version][sample_rate_index]
+    channels = 1 if b3 >> 6 == 3 else 2
+    if layer == 1:
+        samples_per_frame = 384
+    elif layer == 3 and version != 1:
+        samples_per_frame = 576
+    else:
+        samples_per_frame = 1152
+    return version, bitrate * 1000, sample_rate, channels, samples_per_frame
+
+
+def _parse_mp3(f, size: int) -> AudioMetadata:
+    start = _skip_id3v2(f)
+    f.seek(start)
+    data = f.read(MP3_SEARCH_LIMIT)
+    frame = None
+    for offset in range(len(data) - 4):
+        if data[offset] == 0xFF and data[offset + 1] & 0xE0 == 0xE0:
+            frame = _parse_mp3_header(data[offset:])
+            if frame:
+                break
+    if not frame:
+        raise ValueError("no MPEG audio frame found")
+    version, bitrate, sample_rate, channels, samples_per_frame = frame
+    metadata = AudioMetadata(
+        size=size, sample_rate=sample_rate, channels=channels
+    )
+
+    if version == 1:
+        side_info = 17 if channels == 1 else 32
+    else:
+        side_info = 9 if channels == 1 else 17
+    xing = offset + 4 + side_info
+    frames = audio_bytes = None
+    if data.startswith((b"Xing", b"Info"), xing):
+        flags, position = struct.unpack_from(">I", data, xing + 4)[0], xing + 8
+        if flags & 0x1:
+            frames = struct.unpack_from(">I", data, position)[0]
+            position += 4
+        if flags & 0x2:
+            audio_bytes = struct.unpack_from(">I", data, position)[0]
+    elif data.startswith(b"VBRI", offset + 36):
+        audio_bytes, frames = struct.unpack_from(">II", data, offset + 46)
+
+    if frames:
+        metadata.duration = frames * samples_per_frame / sample_rate
+        audio_bytes = audio_bytes or size - start - offset
+        metadata.bitrate = int(audio_bytes * 8 / metadata.duration)
+    else:
+        # constant bitrate: duration follows from the stream size
+        audio_bytes = size - start - offset
+        f.seek(-128, os.SEEK_END)
+        if f.read(3) == b"TAG":
+            audio_bytes -= 128
+        metadata.bitrate = bitrate
+        metadata.duration = audio_bytes * 8 / bitrate
+    return metadata
+
+
+def _parse_ogg(f, size: int) -> AudioMetadata:
+    page = f.read(27)
+    if page[:4] != b"OggS":
+        raise ValueError("not an Ogg file")
+    segments = f.read(page[26])
+    packet = f.read(sum(segments))
+    metadata = AudioMetadata(size=size)
+    pre_skip = 0
+    if packet[:7] == b"\x01vorbis":
+        channels, sample_rate, _, nominal = struct.unpack(
+            "<BIii", packet[11:24]
+        )
+        if not channels or not sample_rate:
+            raise ValueError("invalid Vorbis identification header")
+        granule_rate = sample_rate
+        metadata.bitrate = nominal if nominal > 0 else None
+    elif packet[:8] == b"OpusHead":
+        channels, pre_skip, sample_rate = struct.unpack("<BHI", packet[9:16])
+        sample_rate = sample_rate or OPUS_SAMPLE_RATE
+        granule_rate = OPUS_SAMPLE_RATE
+    else:
+        raise ValueError("unsupported Ogg codec")
+    metadata.channels = channels
+    metadata.sample_rate = sample_rate
+
+    # the granule position of the last page is the stream length
+    f.seek(max(0, size - OGG_TAIL_SIZE))
+    tail = f.read()
+    last_page = tail.rfind(b"OggS")
+    if last_page != -1 and last_page + 14 <= len(tail):
+        granule = struct.unpack_from("<q", tail, last_page + 6)[0]
+        if granule > pre_skip:
+            metadata.duration = (granule - pre_skip) / granule_rate
+            if not metadata.bitrate:
+                metadata.bitrate = int(size * 8 / metadata.duration)
+    return metadata
+
+
+PARSERS = {
+    "wav": _parse_wav,
+    "flac": _parse_flac,
+    "mp3": _parse_mp3,
+    "ogg": _parse_ogg,
+}
+
+
+def extract_metadata(path: str, extension: str) -> AudioMetadata:
+    """
+    Reads duration, bitrate, sample rate and channel count from the
+    container headers of an audio file without decoding it. Fields that
+    cannot be determined are left as None.
+    """
+    size = os.path.getsize(path)
+    parser = PARSERS.get(extension)
+    if parser is None:
+        return AudioMetadata(size=size)
+    try:
+        with open(path, "rb") as f:
+            return parser(f, size)
+    except (ValueError, struct.error, IndexError, OSError) as e:
+        logger.warning("Failed to parse %s headers: %s", extension, e)
+        return AudioMetadata(size=size)
+
+
+async def read_metadata(path: str, extension: str) -> AudioMetadata:
+    """Runs extract_metadata in the process pool."""
+    return await run_in_process(extract_metadata, path, extension)
@@ -0,0 +1,170 @@
+"""
+Moves stored audio into the configured storage backend.
+
+Handles files uploaded before content addressing (``audio_files.blob_id``
+is NULL, bytes at ``filepath``) and blobs whose recorded location differs
+from the one the backend would use (e.g. the old flat ``blobs/<sha256>``
+layout, or a switch from local storage to S3). The tool is idempotent and
+can be stopped and restarted at any time; it runs alongside the API and
+throttles itself with ``--rate``.
+
+Usage:
+    python -m src.audio.migrate_storage [--batch-size 100] [--rate 50]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+
+from sqlalchemy import func, select, update
+from starlette.concurrency import run_in_threadpool
+
+from src.audio.metadata import read_metadata
+from src.audio.models import AudioBlob, AudioFile
+from src.audio.service import AudiFileService
+from src.audio.storage import remove_file, spool_local_file
+from src.infra.db_accessor import db_config
+from src.infra.processes import shutdown_process_pool
+from src.infra.storage import StorageBackend, get_storage
+from src.users.service import UserService
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate_legacy_files(
+    storage: StorageBackend, batch_size: int, delay: float
+) -> int:
+    """
+    Hashes files uploaded before content addressing into blobs, links
+    their AudioFile rows to them and fills in their audio metadata.
+    """
+    migrated = 0
+    last_id = 0
+    while True:
+        async with db_config.AsyncSession_() as session:
+            files = (
+                await session.scalars(
+                    select(AudioFile)
+                    .where(AudioFile.blob_id.is_(None), AudioFile.id > last_id)
+                    .order_by(AudioFile.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not files:
+                return migrated
+            audio_service = AudiFileService(
+                db_session=session,
+                user_service=UserService(db_session=session),
+                storage=storage,
+            )
+            for file in files:
+                last_id = file.id
+                legacy_path = file.filepath
+                if not await run_in_threadpool(os.path.exists, legacy_path):
+                    logger.error(
+                        "file %s: '%s' does not exist", file.id, legacy_path
+                    )
+                    continue
+                spooled = await spool_local_file(legacy_path)
+                extension = file.extension or legacy_path.split(".")[-1]
+                metadata = await read_metadata(spooled.path, extension)
+                blob_id, _ = await audio_service.acquire_blob(spooled)
+                await storage.save(spooled.sha256, spooled.path)
+                await session.execute(
+                    update(AudioFile)
+                    .where(AudioFile.id == file.id)
+                    .values(
+                        blob_id=blob_id,
+                        filepath=storage.locator(spooled.sha256),
+                        extension=extension,
+                        **metadata.as_columns(),
+                    )
+                )
+                await session.commit()
+                still_used = await session.scalar(
+                    select(func.count(AudioFile.id)).where(
+                        AudioFile.blob_id.is_(None),
+                        AudioFile.filepath == legacy_path,
+                    )
+                )
+                if not still_used:
+                    await remove_file(legacy_path)
+                migrated += 1
+                await asyncio.sleep(delay)
+
+
+async def relocate_blobs(
+    storage: StorageBackend, batch_size: int, delay: float
+) -> int:
+    """
+    Moves blobs whose recorded location is not where ``storage`` keeps
+    them.
+    """
+    relocated = 0
+    last_id = 0
+    while True:
+        async with db_config.AsyncSession_() as session:
+            blobs = (
+                await session.scalars(
+                    select(AudioBlob)
+                    .where(AudioBlob.id > last_id)
+                    .order_by(AudioBlob.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not blobs:
+                return relocated
+            for blob in blobs:
+                last_id = blob.id
+                locator = storage.locator(blob.sha256)
+                if blob.filepath == locator:
+                    continue
+                if await storage.exists(blob.sha256):
+                    await remove_file(blob.filepath)
+                elif await run_in_threadpool(os.path.exists, blob.filepath):
+                    await storage.save(blob.sha256, blob.filepath)
+                else:
+                    logger.error(
+                        "blob %s: '%s' does not exist",
+                        blob.sha256,
+                        blob.filepath,
+                    )
+                    continue
+                await session.execute(
+                    update(AudioBlob)
+                    .where(AudioBlob.id == blob.id)
+                    .values(filepath=locator)
+                )
+                await session.execute(
+                    update(AudioFile)
+                    .where(AudioFile.blob_id == blob.id)
+                    .values(filepath=locator)
+                )
+                await session.commit()
+                relocated += 1
+                await asyncio.sleep(delay)
+
+
+async def migrate(batch_size: int, rate: float) -> None:
+    storage = get_storage()
+    delay = 1 / rate if rate > 0 else 0
+    migrated = await migrate_legacy_files(storage, batch_size, delay)
+    logger.info("Migrated %s legacy files", migrated)
+    relocated = await relocate_blobs(storage, batch_size, delay)
+    logger.info("Relocated %s blobs", relocated)
+    shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=50,
+        help="max files per second, 0 for no limit",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(migrate(batch_size=args.batch_size, rate=args.rate))
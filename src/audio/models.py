@@ -1,7 +1,21 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    FetchedValue,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    false,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.infra.db_accessor import Base
@@ -10,20 +24,136 @@ if TYPE_CHECKING:
     from src.users.models import UserProfile
 
 
+# no stemming or stop words: names and descriptions come in any language
+SEARCH_CONFIG = "simple"
+# characters that separate the words of a filename ("drum_loop-01.v2");
+# the default parser would read "-01" as a signed number, for example
+FILENAME_SEPARATORS = "-_."
+# descriptions are searched up to this many characters: a tsvector is
+# limited to 1 MB, and ts_headline reads the whole text
+SEARCH_DESCRIPTION_LENGTH = 100_000
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class AudioBlob(Base):
+    __tablename__ = "audio_blobs"
+    __table_args__ = (
+        # lets the garbage collector find unreferenced blobs without a scan
+        Index(
+            "ix_audio_blobs_unreferenced",
+            "id",
+            postgresql_where=text("refcount <= 0"),
+        ),
+    )
+    id: Mapped[int] = mapped_column(primary_key=True, nullable=False)
+    sha256: Mapped[str] = mapped_column(
+        String(64), nullable=False, unique=True, index=True
+    )
+    filepath: Mapped[str] = mapped_column(String(), nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger(), nullable=False)
+    refcount: Mapped[int] = mapped_column(Integer(), nullable=False, default=0)
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(), nullable=False, default=utcnow
+    )
+
+
 class AudioFile(Base):
     __tablename__ = "audio_files"
+    __table_args__ = (
+        # keyset pagination of a user's files: WHERE owner_id = ?
+        # AND (created_at, id) > (?, ?) ORDER BY created_at, id
+        Index(
+            "ix_audio_files_owner_id_created_at_id",
+            "owner_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_audio_files_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
     id: Mapped[int] = mapped_column(primary_key=True, nullable=False)
     filename: Mapped[str] = mapped_column(String(100), nullable=False)
     filepath: Mapped[str] = mapped_column(String(), nullable=False)
     description: Mapped[str] = mapped_column(String(), nullable=True)
+    extension: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    duration: Mapped[Optional[float]] = mapped_column(Float(), nullable=True)
+    bitrate: Mapped[Optional[int]] = mapped_column(Integer(), nullable=True)
+    sample_rate: Mapped[Optional[int]] = mapped_column(
+        Integer(), nullable=True
+    )
+    channels: Mapped[Optional[int]] = mapped_column(
+        SmallInteger(), nullable=True
+    )
+    size: Mapped[Optional[int]] = mapped_column(BigInteger(), nullable=True)
     created_at: Mapped[DateTime] = mapped_column(
-        DateTime(), nullable=False, default=datetime.now(timezone.utc)
+        DateTime(), nullable=False, default=utcnow
     )
     updated_at: Mapped[Optional[DateTime]] = mapped_column(
-        DateTime(), nullable=True, onupdate=datetime.now(timezone.utc)
+        DateTime(), nullable=True, onupdate=utcnow
     )
     owner_id: Mapped[int] = mapped_column(ForeignKey("userprofile.id"))
+    blob_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("audio_blobs.id"), nullable=True, index=True
+    )
+    # set by the audio_files_search_vector trigger on every insert and
+    # change of filename or description (migration d93a7c5e1b48), from
+    # SEARCH_CONFIG, FILENAME_SEPARATORS and SEARCH_DESCRIPTION_LENGTH;
+    # filename matches rank above description matches
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR(),
+        nullable=True,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        deferred=True,
+    )
 
     owner: Mapped["UserProfile"] = relationship(
         "UserProfile", back_populates="audio_files"
     )
+    blob: Mapped[Optional["AudioBlob"]] = relationship("AudioBlob")
+
+
+class UploadSession(Base):
+    __tablename__ = "upload_sessions"
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("userprofile.id"), index=True
+    )
+    filename: Mapped[str] = mapped_column(String(100), nullable=False)
+    description: Mapped[str] = mapped_column(String(), nullable=True)
+    extension: Mapped[str] = mapped_column(String(10), nullable=False)
+    total_size: Mapped[int] = mapped_column(BigInteger(), nullable=False)
+    chunk_size: Mapped[int] = mapped_column(Integer(), nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(), nullable=False)
+    expires_at: Mapped[DateTime] = mapped_column(
+        DateTime(), nullable=False, index=True
+    )
+    # set while the chunks are being assembled, outside any transaction
+    completing: Mapped[bool] = mapped_column(
+        Boolean(), nullable=False, default=False, server_default=false()
+    )
+
+    @property
+    def chunk_count(self) -> int:
+        return -(-self.total_size // self.chunk_size)
+
+    def expected_chunk_size(self, index: int) -> int:
+        if index < self.chunk_count - 1:
+            return self.chunk_size
+        return self.total_size - self.chunk_size * (self.chunk_count - 1)
+
+
+class UploadSessionChunk(Base):
+    __tablename__ = "upload_session_chunks"
+    session_id: Mapped[str] = mapped_column(
+        ForeignKey("upload_sessions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    index: Mapped[int] = mapped_column(Integer(), primary_key=True)
+    size: Mapped[int] = mapped_column(Integer(), nullable=False)
@@ -0,0 +1,66 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, or_, tuple_
+
+from src.exceptions import InvalidCursor
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Packs the sort key of the last row of a page into an opaque,
+    URL-safe cursor.
+    """
+    payload = json.dumps(
+        [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in values
+        ],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor()
+    if not isinstance(values, list):
+        raise InvalidCursor()
+    return values
+
+
+def keyset_after(
+    column,
+    tiebreaker,
+    value: Any,
+    last_id: int,
+    descending: bool = False,
+    nullable: bool = False,
+) -> ColumnElement[bool]:
+    """
+    Returns the condition selecting rows after ``(value, last_id)`` in
+    ``ORDER BY column, tiebreaker`` (both ascending or both descending,
+    NULLs last).
+
+    For NOT NULL columns this is a row comparison, which PostgreSQL
+    resolves with a range scan of a ``(..., column, tiebreaker)`` index.
+    """
+    if value is None:
+        # already in the NULL tail
+        after_id = tiebreaker < last_id if descending else tiebreaker > last_id
+        return and_(column.is_(None), after_id)
+    if not nullable:
+        key = tuple_(column, tiebreaker)
+        return key < (value, last_id) if descending else key > (value, last_id)
+    after = (
+        or_(column < value, and_(column == value, tiebreaker < last_id))
+        if descending
+        else or_(column > value, and_(column == value, tiebreaker > last_id))
+    )
+    return or_(after, column.is_(None))
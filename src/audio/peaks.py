@@ -0,0 +1,260 @@
+import os
+import shutil
+import struct
+import subprocess
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Waveform peaks: per bucket of samples, the minimum and maximum amplitude
+# over all channels, quantized to int8. Computed in the process pool.
+# NumPy is imported on first use: web workers only need it in read_level,
+# to merge a stored level down.
+#
+# File layout (little endian):
+#   b"PEAK", version (u8), level count (u8)
+#   per level: resolution (u32), point count (u32),
+#              point count * (min, max) as int8
+
+PEAKS_MAGIC = b"PEAK"
+PEAKS_VERSION = 1
+HEADER = struct.Struct("<4sBB")
+LEVEL_HEADER = struct.Struct("<II")
+
+SAMPLES_PER_BUCKET = 256
+BLOCK_FRAMES = SAMPLES_PER_BUCKET * 1024
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# sample sizes _decode_pcm can read, by format
+SAMPLE_BITS = {
+    WAVE_FORMAT_PCM: (8, 16, 24, 32),
+    WAVE_FORMAT_IEEE_FLOAT: (32, 64),
+}
+
+
+def _decode_pcm(data: bytes, format_tag: int, bits: int) -> "np.ndarray":
+    """Converts raw little-endian samples to float32 in [-1, 1]."""
+    import numpy as np
+
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        dtype = {32: "<f4", 64: "<f8"}[bits]
+        return np.frombuffer(data, dtype=dtype).astype(np.float32)
+    if bits == 8:
+        samples = np.frombuffer(data, dtype=np.uint8).astype(np.float32)
+        return (samples - 128) / 128
+    if bits == 24:
+        # pad to 32 bits in the high bytes, then shift back keeping the sign
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        padded = np.zeros((len(raw), 4), dtype=np.uint8)
+        padded[:, 1:] = raw
+        samples = padded.view("<i4").ravel() >> 8
+        return samples.astype(np.float32) / (1 << 23)
+    dtype = {16: "<i2", 32: "<i4"}[bits]
+    samples = np.frombuffer(data, dtype=dtype).astype(np.float32)
+    return samples / (1 << (bits - 1))
+
+
+def _wav_blocks(path: str) -> Iterator["np.ndarray"]:
+    """Yields (frames, channels) float32 blocks of a PCM WAV file."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if header[:4] not in (b"RIFF", b"RF64") or header[8:12] != b"WAVE":
+            raise ValueError("not a RIFF/WAVE file")
+        fmt = None
+        while chunk_header := f.read(8):
+            if len(chunk_header) < 8:
+                break
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size + chunk_size % 2)
+            elif chunk_id == b"data":
+                break
+            else:
+                f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+        else:
+            raise ValueError("no data chunk")
+        if fmt is None or len(fmt) < 16:
+            raise ValueError("no fmt chunk")
+        format_tag, channels, _, _, block_align, bits = struct.unpack(
+            "<HHIIHH", fmt[:16]
+        )
+        if format_tag == WAVE_FORMAT_EXTENSIBLE:
+            if len(fmt) < 26:
+                raise ValueError("truncated WAVE_FORMAT_EXTENSIBLE header")
+            format_tag = struct.unpack("<H", fmt[24:26])[0]
+        if format_tag not in SAMPLE_BITS:
+            raise ValueError(f"unsupported WAV format {format_tag}")
+        if bits not in SAMPLE_BITS[format_tag]:
+            raise ValueError(f"unsupported WAV sample size {bits}")
+        if not channels or block_align != channels * bits // 8:
+            raise ValueError(
+                f"invalid WAV block size {block_align} for {channels} "
+                f"channels of {bits} bits"
+            )
+        if chunk_size == 0xFFFFFFFF or chunk_size > size - f.tell():
+            chunk_size = size - f.tell()
+
+        remaining = chunk_size - chunk_size % block_align
+        while remaining > 0:
+            data = f.read(min(remaining, BLOCK_FRAMES * block_align))
+            data = data[: len(data) - len(data) % block_align]
+            if not data:
+                break
+            remaining -= len(data)
+            samples = _decode_pcm(data, format_tag, bits)
+            yield samples.reshape(-1, channels)
+
+
+def _ffmpeg_blocks(path: str, channels: int) -> Iterator["np.ndarray"]:
+    """
+    Yields (frames, channels) float32 blocks of any format ffmpeg can
+    decode. ffmpeg streams raw float samples through a pipe, so memory use
+    does not depend on the length of the file.
+    """
+    import numpy as np
+
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise ValueError("ffmpeg is required to decode compressed audio")
+    process = subprocess.Popen(
+        [
+            ffmpeg,
+            "-v",
+            "error",
+            "-i",
+            path,
+            "-f",
+            "f32le",
+            "-ac",
+            str(channels),
+            "-",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stdin=subprocess.DEVNULL,
+    )
+    try:
+        while data := process.stdout.read(BLOCK_FRAMES * channels * 4):
+            data = data[: len(data) - len(data) % (channels * 4)]
+            yield np.frombuffer(data, dtype="<f4").reshape(-1, channels)
+    finally:
+        process.stdout.close()
+        stderr = process.stderr.read()
+        process.stderr.close()
+        if process.wait() != 0:
+            raise ValueError(f"ffmpeg failed: {stderr.decode()[-200:]}")
+
+
+def _bucket_peaks(
+    blocks: Iterator["np.ndarray"],
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Reduces decoded blocks to the min and max of every SAMPLES_PER_BUCKET
+    frames, across all channels.
+    """
+    import numpy as np
+
+    mins, maxs = [], []
+    carry_min = carry_max = np.empty(0, dtype=np.float32)
+    for block in blocks:
+        frame_min = np.concatenate((carry_min, block.min(axis=1)))
+        frame_max = np.concatenate((carry_max, block.max(axis=1)))
+        whole = len(frame_min) - len(frame_min) % SAMPLES_PER_BUCKET
+        mins.append(frame_min[:whole].reshape(-1, SAMPLES_PER_BUCKET).min(1))
+        maxs.append(frame_max[:whole].reshape(-1, SAMPLES_PER_BUCKET).max(1))
+        carry_min, carry_max = frame_min[whole:], frame_max[whole:]
+    if len(carry_min):
+        mins.append(carry_min.min(keepdims=True))
+        maxs.append(carry_max.max(keepdims=True))
+    if not mins:
+        raise ValueError("no audio samples")
+    return np.concatenate(mins), np.concatenate(maxs)
+
+
+def _downsample(
+    mins: "np.ndarray", maxs: "np.ndarray", points: int
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """Merges adjacent peaks so that at most ``points`` remain."""
+    import numpy as np
+
+    if len(mins) <= points:
+        return mins, maxs
+    bounds = np.linspace(0, len(mins), points + 1).astype(np.int64)[:-1]
+    return np.minimum.reduceat(mins, bounds), np.maximum.reduceat(maxs, bounds)
+
+
+def _interleave(mins: "np.ndarray", maxs: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    interleaved = np.empty(len(mins) * 2, dtype=mins.dtype)
+    interleaved[0::2] = mins
+    interleaved[1::2] = maxs
+    return interleaved
+
+
+def _quantize(mins: "np.ndarray", maxs: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    interleaved = _interleave(mins, maxs)
+    return np.clip(np.round(interleaved * 127), -128, 127).astype(np.int8)
+
+
+def peaks_key(sha256: str) -> str:
+    """Returns the storage key of the peaks of the blob ``sha256``."""
+    return f"{sha256}.peaks"
+
+
+def compute_peaks(
+    path: str, extension: str, channels: int | None, resolutions: list[int]
+) -> bytes:
+    """
+    Decodes an audio file and returns its peaks at each of ``resolutions``
+    (points per file) in the binary peaks format. WAV files are decoded
+    with NumPy directly, other formats through ffmpeg.
+    """
+    if extension == "wav":
+        blocks = _wav_blocks(path)
+    else:
+        blocks = _ffmpeg_blocks(path, channels or 1)
+    mins, maxs = _bucket_peaks(blocks)
+    levels = sorted(set(resolutions))
+    parts = [HEADER.pack(PEAKS_MAGIC, PEAKS_VERSION, len(levels))]
+    for resolution in levels:
+        level = _quantize(*_downsample(mins, maxs, resolution))
+        parts.append(LEVEL_HEADER.pack(resolution, len(level) // 2))
+        parts.append(level.tobytes())
+    return b"".join(parts)
+
+
+def read_level(data: bytes, resolution: int) -> bytes:
+    """
+    Returns interleaved int8 (min, max) pairs for at most ``resolution``
+    points, merged down from the closest stored level.
+    """
+    magic, version, level_count = HEADER.unpack_from(data)
+    if magic != PEAKS_MAGIC or version != PEAKS_VERSION:
+        raise ValueError("unsupported peaks data")
+    offset = HEADER.size
+    levels = []
+    for _ in range(level_count):
+        level_resolution, points = LEVEL_HEADER.unpack_from(data, offset)
+        offset += LEVEL_HEADER.size
+        end = offset + points * 2
+        levels.append((level_resolution, data[offset:end]))
+        offset = end
+    # the smallest level at least as detailed as requested, else the finest
+    _, level = next(
+        (level for level in levels if level[0] >= resolution), levels[-1]
+    )
+    if len(level) // 2 <= resolution:
+        return level
+    import numpy as np
+
+    peaks = np.frombuffer(level, dtype=np.int8)
+    return _interleave(
+        *_downsample(peaks[0::2], peaks[1::2], resolution)
+    ).tobytes()
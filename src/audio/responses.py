@@ -0,0 +1,103 @@
+import os
+from urllib.parse import quote
+
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from src.settings import settings
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+class AudioFileResponse(FileResponse):
+    """
+    FileResponse that hands the file descriptor to the server for sendfile()
+    when the ASGI server supports the ``http.response.zerocopysend``
+    extension. Otherwise the file is streamed by Starlette in
+    FILE_DOWNLOAD_CHUNK_SIZE chunks. Range requests are handled in both
+    cases.
+    """
+
+    chunk_size = settings.FILE_DOWNLOAD_CHUNK_SIZE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self._zerocopy = ZEROCOPY_EXTENSION in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+
+    async def _zerocopy_send(self, send: Send, offset: int, count: int):
+        with open(self.path, mode="rb") as file:
+            await send(
+                {
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": file,
+                    "offset": offset,
+                    "count": count,
+                    "more_body": False,
+                }
+            )
+
+    async def _handle_simple(self, send: Send, send_header_only: bool):
+        if not self._zerocopy or send_header_only:
+            return await super()._handle_simple(send, send_header_only)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        await self._zerocopy_send(send, 0, int(self.headers["content-length"]))
+
+    async def _handle_single_range(
+        self,
+        send: Send,
+        start: int,
+        end: int,
+        file_size: int,
+        send_header_only: bool,
+    ):
+        if not self._zerocopy or send_header_only:
+            return await super()._handle_single_range(
+                send, start, end, file_size, send_header_only
+            )
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 206,
+                "headers": self.raw_headers,
+            }
+        )
+        await self._zerocopy_send(send, start, end - start)
+
+
+def audio_file_response(
+    path: str, filename: str, media_type: str | None
+) -> Response:
+    """
+    Builds the response serving a stored audio file.
+
+    If FILE_DOWNLOAD_ACCEL_REDIRECT_PREFIX is set, the body is left to the
+    reverse proxy (nginx ``X-Accel-Redirect``), which serves it with
+    sendfile() and handles Range requests itself.
+    """
+    if settings.FILE_DOWNLOAD_ACCEL_REDIRECT_PREFIX:
+        prefix = settings.FILE_DOWNLOAD_ACCEL_REDIRECT_PREFIX
+        relative_path = os.path.relpath(
+            path, os.path.abspath(settings.FILE_UPLOAD_DIRECTORY)
+        )
+        return Response(
+            media_type=media_type,
+            headers={
+                "X-Accel-Redirect": prefix + quote(relative_path),
+                "Content-Disposition": "inline; filename*=utf-8''"
+                + quote(filename),
+            },
+        )
+    return AudioFileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        content_disposition_type="inline",
+    )
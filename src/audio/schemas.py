@@ -1,9 +1,22 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Literal
 
 from fastapi import UploadFile
-from pydantic import BaseModel, field_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    computed_field,
+    field_validator,
+    model_validator,
+)
 
 ALLOWED_EXTENSIONS = {"mp3", "wav", "flac", "ogg"}
+AUDIO_MEDIA_TYPES = {
+    "mp3": "audio/mpeg",
+    "wav": "audio/wav",
+    "flac": "audio/flac",
+    "ogg": "audio/ogg",
+}
 
 
 class FileBase(BaseModel):
@@ -32,3 +45,162 @@ class FileResponseSchema(FileBase):
     filepath: str
     created_at: datetime
     updated_at: datetime | None = None
+    duration: float | None = None
+    bitrate: int | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+    size: int | None = None
+
+    @computed_field
+    @property
+    def content_url(self) -> str:
+        return f"/audios/{self.id}/content"
+
+
+class FileFilterSchema(BaseModel):
+    filename: str | None = Field(
+        default=None, min_length=1, description="Filename prefix"
+    )
+    extension: str | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    min_duration: float | None = Field(default=None, ge=0)
+    max_duration: float | None = Field(default=None, ge=0)
+    sample_rate: int | None = None
+    channels: int | None = None
+    order_by: Literal[
+        "created_at", "filename", "duration", "size", "bitrate"
+    ] = "created_at"
+    descending: bool = False
+    limit: int = Field(default=50, ge=1, le=500)
+    cursor: str | None = Field(
+        default=None, description="next_cursor of the previous page"
+    )
+
+    @field_validator("extension", mode="after")
+    @classmethod
+    def normalize_extension(cls, value):
+        return value.lower().lstrip(".") if value else value
+
+    @field_validator("created_from", "created_to", mode="after")
+    @classmethod
+    def to_naive_utc(cls, value):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+class FileBulkDeleteSchema(BaseModel):
+    """Files matching every given criterion are deleted."""
+
+    file_ids: list[int] | None = Field(default=None, max_length=100_000)
+    owner_id: int | None = None
+    extension: str | None = None
+    created_before: datetime | None = None
+
+    @field_validator("extension", mode="after")
+    @classmethod
+    def normalize_extension(cls, value):
+        return value.lower().lstrip(".") if value else value
+
+    @field_validator("created_before", mode="after")
+    @classmethod
+    def to_naive_utc(cls, value):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @model_validator(mode="after")
+    def require_criteria(self):
+        if self.model_dump(exclude_none=True) == {}:
+            raise ValueError("At least one criterion is required")
+        return self
+
+
+class FileBulkDeleteResultSchema(BaseModel):
+    deleted: int
+
+
+class BatchUploadResultSchema(BaseModel):
+    index: int
+    source_filename: str | None = None
+    file: FileResponseSchema | None = None
+    error: str | None = None
+
+
+class BatchUploadSchema(BaseModel):
+    results: list[BatchUploadResultSchema]
+
+    @computed_field
+    @property
+    def created(self) -> int:
+        return sum(result.file is not None for result in self.results)
+
+    @computed_field
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.created
+
+
+class FilePageSchema(BaseModel):
+    items: list[FileResponseSchema]
+    next_cursor: str | None = None
+
+
+class FileSearchSchema(BaseModel):
+    q: str = Field(
+        min_length=1,
+        max_length=200,
+        description="Words of the filename or description, "
+        "the last one may be incomplete",
+    )
+    limit: int = Field(default=20, ge=1, le=100)
+    cursor: str | None = Field(
+        default=None, description="next_cursor of the previous page"
+    )
+
+
+class FileSearchResultSchema(FileResponseSchema):
+    rank: float
+    filename_highlight: str = Field(
+        description="HTML with the matches in <mark>"
+    )
+    description_highlight: str = Field(
+        description="HTML fragments with the matches in <mark>"
+    )
+
+
+class FileSearchPageSchema(BaseModel):
+    items: list[FileSearchResultSchema]
+    next_cursor: str | None = None
+
+
+class UploadSessionCreateSchema(FileBase):
+    source_filename: str
+    total_size: int = Field(gt=0)
+    chunk_size: int | None = Field(default=None, gt=0)
+
+    @field_validator("source_filename", mode="after")
+    @classmethod
+    def validate_source_extension(cls, value):
+        extension = value.split(".")[-1].lower()
+        if extension not in ALLOWED_EXTENSIONS:
+            raise ValueError(
+                "Invalid file type. Only audio files are allowed."
+            )
+        return value
+
+
+class UploadSessionSchema(BaseModel):
+    id: str
+    filename: str
+    total_size: int
+    chunk_size: int
+    chunk_count: int
+    missing_chunks: list[int]
+    expires_at: datetime
+
+
+class UploadChunkSchema(BaseModel):
+    index: int
+    size: int
@@ -0,0 +1,77 @@
+import html
+import re
+
+from sqlalchemy import ColumnElement, func
+from sqlalchemy.dialects import postgresql
+
+from src.audio.models import SEARCH_CONFIG, SEARCH_DESCRIPTION_LENGTH
+
+# letters and digits; underscores separate words, as in filenames
+WORD = re.compile(r"[^\W_]+")
+MAX_SEARCH_TERMS = 16
+
+# ts_headline marks matches with these control characters; snippets are
+# HTML-escaped before they become <mark>, so file text cannot add markup
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+    'MaxFragments=2, MaxWords=20, MinWords=5, FragmentDelimiter=" … "'
+)
+
+
+def search_terms(text: str) -> list[str]:
+    return [word.lower() for word in WORD.findall(text)][:MAX_SEARCH_TERMS]
+
+
+def prefix_tsquery(terms: list[str]) -> ColumnElement:
+    """
+    A tsquery matching rows that contain every term, the last one typed or
+    not (``drum lo`` -> ``drum:* & lo:*``). Terms are letters and digits
+    only, so the query is always valid.
+    """
+    return postgresql.to_tsquery(
+        SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms)
+    )
+
+
+def headline(column, tsquery: ColumnElement) -> ColumnElement:
+    """
+    Fragments of ``column`` around the matches of ``tsquery``, within the
+    part of the text that is indexed.
+    """
+    return postgresql.ts_headline(
+        SEARCH_CONFIG,
+        func.left(func.coalesce(column, ""), SEARCH_DESCRIPTION_LENGTH),
+        tsquery,
+        HEADLINE_OPTIONS,
+    )
+
+
+def highlight(snippet: str) -> str:
+    """Returns a ts_headline snippet as HTML with matches in <mark>."""
+    return (
+        html.escape(snippet)
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_STOP, "</mark>")
+    )
+
+
+def highlight_filename(filename: str, terms: list[str]) -> str:
+    """
+    Returns ``filename`` as HTML with the words starting with one of
+    ``terms`` in <mark>. Filenames are short, so this is done here rather
+    than by ts_headline, which would split them differently from the
+    search vector.
+    """
+    prefixes = tuple(terms)
+    parts = []
+    position = 0
+    for word in WORD.finditer(filename):
+        start, end = word.span()
+        if word.group().lower().startswith(prefixes):
+            parts.append(html.escape(filename[position:start]))
+            parts.append(f"<mark>{html.escape(word.group())}</mark>")
+            position = end
+    parts.append(html.escape(filename[position:]))
+    return "".join(parts)
@@ -1,36 +1,134 @@
+import asyncio
 import logging
 import os
-from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Sequence
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Sequence
 
 from fastapi import UploadFile
-from sqlalchemy import delete, insert, select
+from sqlalchemy import (
+    Integer,
+    any_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
+from starlette.concurrency import run_in_threadpool
 
-from src.audio.models import AudioFile
-from src.audio.schemas import FileCreateSchema, FileResponseSchema
-from src.exceptions import FileNotFoundError_
+from src.audio.metadata import read_metadata
+from src.audio.models import (
+    AudioBlob,
+    AudioFile,
+    UploadSession,
+    UploadSessionChunk,
+)
+from src.audio.pagination import decode_cursor, encode_cursor, keyset_after
+from src.audio.peaks import compute_peaks, peaks_key, read_level
+from src.audio.schemas import (
+    ALLOWED_EXTENSIONS,
+    AUDIO_MEDIA_TYPES,
+    BatchUploadResultSchema,
+    BatchUploadSchema,
+    FileBulkDeleteSchema,
+    FileCreateSchema,
+    FileFilterSchema,
+    FilePageSchema,
+    FileResponseSchema,
+    FileSearchPageSchema,
+    FileSearchResultSchema,
+    FileSearchSchema,
+    UploadChunkSchema,
+    UploadSessionCreateSchema,
+    UploadSessionSchema,
+)
+from src.audio.search import (
+    headline,
+    highlight,
+    highlight_filename,
+    prefix_tsquery,
+    search_terms,
+)
+from src.audio.storage import (
+    SpooledUpload,
+    assemble_chunks,
+    discard,
+    remove_file,
+    remove_session_directory,
+    save_chunk,
+    spool_upload,
+    temporary_path,
+    write_temporary,
+)
+from src.auth.schemas import TokenData
+from src.exceptions import (
+    BatchTooLarge,
+    FileError,
+    FileNotFoundError_,
+    FileNotSupported,
+    FileTooLarge,
+    InvalidCursor,
+    PeaksNotAvailable,
+    UploadChunkInvalid,
+    UploadIncomplete,
+    UploadSessionCompleting,
+    UploadSessionNotFound,
+)
+from src.infra.processes import run_in_process
+from src.infra.storage import StorageBackend, get_storage
+from src.monitoring.metrics import UPLOAD_BYTES, UPLOAD_DURATION, UPLOADS
 from src.settings import settings
-from src.users.models import UserProfile
+from src.users.models import Roles, UserProfile
 from src.users.service import UserService
 
+logger = logging.getLogger(__name__)
+
+# true in RETURNING when an upsert inserted the row rather than updating it
+BLOB_CREATED = literal_column("xmax = 0").label("created")
+
+# largest values of the integer columns a cursor carries
+INTEGER_MAX = 2**31 - 1
+BIGINTEGER_MAX = 2**63 - 1
+
+
+def _fits_integer(value, maximum: int) -> bool:
+    return (
+        isinstance(value, int)
+        and not isinstance(value, bool)
+        and -maximum - 1 <= value <= maximum
+    )
+
+
+@dataclass
+class FileDownload:
+    """Where the content of an AudioFile can be served from."""
+
+    filename: str
+    media_type: str | None
+    path: str | None = None
+    url: str | None = None
+
 
 @dataclass
 class AudiFileService:
     db_session: AsyncSession
     user_service: UserService
+    # reads that tolerate replication lag; db_session if not set
+    read_session: AsyncSession | None = None
+    storage: StorageBackend = field(default_factory=get_storage)
     # cache: FileCacheRepository
 
-    @staticmethod
-    def _create_dir():
-        """
-        Creates the directory for file uploads if it does not already exist.
-        """
-        if not os.path.exists(settings.FILE_UPLOAD_DIRECTORY):
-            os.makedirs(settings.FILE_UPLOAD_DIRECTORY)
-
     async def get_all_files(self) -> Sequence[AudioFile]:
         res = await self.db_session.scalars(
             select(AudioFile).options(
@@ -49,53 +147,473 @@ class AudiFileService:
         Uploads an audio file with specified filename, stores it in the system,
         and saves its metadata to the database.
         """
-        await self.user_service.get_user_by_id(file_upload.owner_id)
+        await self.user_service.get_user_by_id(
+            file_upload.owner_id, session=self.db_session
+        )
+        # release the connection while the body streams to disk
+        await self.db_session.commit()
 
+        started = time.perf_counter()
         data = file_upload.model_dump(exclude_none=True, exclude={"file"})
-        data["created_at"] = datetime.now(timezone.utc).replace(tzinfo=None)
-        extension = file.filename.split(".")[-1].lower()
+        data["extension"] = file.filename.split(".")[-1].lower()
+        spooled = await spool_upload(file)
+        stored = await self.store_spooled(data, spooled)
+        UPLOAD_DURATION.observe(time.perf_counter() - started)
+        UPLOAD_BYTES.inc(spooled.size)
+        UPLOADS.inc()
+        return stored
 
-        self._create_dir()
-        path_ = os.path.join(
-            settings.FILE_UPLOAD_DIRECTORY,
-            f"{file_upload.filename}.{extension}",
-        )
-        absolute_path = os.path.abspath(path_)
-        content = await file.read()
-        with open(path_, "wb") as f_write:
-            f_write.write(content)
+    async def store_spooled(
+        self, data: dict, spooled: SpooledUpload
+    ) -> FileResponseSchema:
+        """
+        Commits a spooled upload to the blob store and saves its AudioFile
+        row. Any statements already pending on the session are committed
+        in the same transaction.
+        """
+        data["created_at"] = datetime.now(timezone.utc).replace(tzinfo=None)
+        created = committing = False
         try:
-            data["filepath"] = absolute_path
+            metadata = await read_metadata(spooled.path, data["extension"])
+            data.update(metadata.as_columns())
+            blob_id, created = await self.acquire_blob(spooled)
+            await self.storage.save(spooled.sha256, spooled.path)
+            data["blob_id"] = blob_id
+            data["filepath"] = self.storage.locator(spooled.sha256)
             res = await self.db_session.execute(
                 insert(AudioFile).values(**data).returning(AudioFile.id)
             )
+            committing = True
             await self.db_session.commit()
         except Exception as e:
+            if created and not committing:
+                await self._remove_created_blobs([spooled.sha256])
             await self.db_session.rollback()
-            logging.error(
-                f"Failed to create AudiFile row: {file_upload.filename}. "
-                f"Error: {str(e)}"
+            await discard(spooled)
+            logger.error(
+                "Failed to create AudiFile row: %s. Error: %s",
+                data["filename"],
+                e,
             )
             raise
         data["id"] = res.scalar()
         return FileResponseSchema(**data)
 
-    async def get_files_by_user(self, user_id: int) -> Sequence[AudioFile]:
+    async def _remove_created_blobs(self, sha256s: list[str]) -> None:
+        """
+        Removes the stored content of blobs whose rows the failed
+        transaction created. Called before the rollback: until then,
+        uploads of the same content wait on the uncommitted rows, so none
+        of them relies on the content yet. After a failed commit the
+        outcome is unknown and the content is kept.
+        """
+        try:
+            await self.storage.delete_many(sha256s)
+        except Exception as e:
+            logger.error("Failed to remove blobs %s. Error: %s", sha256s, e)
+
+    async def upload_batch(
+        self, owner_id: int, files: list[UploadFile], description: str
+    ) -> BatchUploadSchema:
         """
-        Retrieves all audio files associated with a specific user.
+        Uploads many audio files at once. Files are spooled and parsed
+        concurrently (at most BATCH_UPLOAD_CONCURRENCY at a time), then
+        all rows are written in one transaction: one upsert for the
+        blobs and one multi-row INSERT for the AudioFile rows. A file
+        that fails is reported in its result without failing the others.
         """
+        if len(files) > settings.BATCH_UPLOAD_MAX_FILES:
+            raise BatchTooLarge(settings.BATCH_UPLOAD_MAX_FILES)
+        await self.user_service.get_user_by_id(
+            owner_id, session=self.db_session
+        )
+        # release the connection while the bodies stream to disk
+        await self.db_session.commit()
+
+        results = [
+            BatchUploadResultSchema(index=index, source_filename=file.filename)
+            for index, file in enumerate(files)
+        ]
+        semaphore = asyncio.Semaphore(settings.BATCH_UPLOAD_CONCURRENCY)
+
+        async def spool(index: int, file: UploadFile):
+            name, _, extension = (file.filename or "").rpartition(".")
+            extension = extension.lower()
+            if not name or extension not in ALLOWED_EXTENSIONS:
+                results[index].error = FileNotSupported(
+                    extension if name else None
+                ).detail
+                return None
+            async with semaphore:
+                try:
+                    spooled = await spool_upload(file)
+                except FileError as e:
+                    results[index].error = e.detail
+                    return None
+                try:
+                    metadata = await read_metadata(spooled.path, extension)
+                except BaseException:
+                    await discard(spooled)
+                    raise
+            data = {
+                "filename": name[:100],
+                "description": description,
+                "extension": extension,
+                "owner_id": owner_id,
+                **metadata.as_columns(),
+            }
+            return index, data, spooled
+
+        # every file is awaited, so one unexpected error does not leave
+        # the temporary files of the others behind
+        outcomes = await asyncio.gather(
+            *(spool(index, file) for index, file in enumerate(files)),
+            return_exceptions=True,
+        )
+        spooled_items = [item for item in outcomes if isinstance(item, tuple)]
+        errors = [e for e in outcomes if isinstance(e, BaseException)]
+        if errors:
+            for item in spooled_items:
+                await discard(item[2])
+            raise errors[0]
+        if not spooled_items:
+            return BatchUploadSchema(results=results)
+
+        by_sha256: dict[str, list] = defaultdict(list)
+        for item in spooled_items:
+            by_sha256[item[2].sha256].append(item)
+        created: set[str] = set()
+        committing = False
+        try:
+            blob_ids, created = await self._acquire_blobs(
+                {
+                    sha: [i[2] for i in items]
+                    for sha, items in by_sha256.items()
+                }
+            )
+
+            async def save(sha256: str, items: list) -> bool:
+                # identical content in one batch is stored once
+                for _, _, duplicate in items[1:]:
+                    await discard(duplicate)
+                async with semaphore:
+                    try:
+                        await self.storage.save(sha256, items[0][2].path)
+                    except Exception as e:
+                        logger.error(
+                            "Failed to store blob %s. Error: %s", sha256, e
+                        )
+                        for index, _, _ in items:
+                            results[index].error = "Failed to store file"
+                        return False
+                return True
+
+            saved = await asyncio.gather(
+                *(save(sha, items) for sha, items in by_sha256.items())
+            )
+            failed = {
+                sha: len(items)
+                for (sha, items), ok in zip(by_sha256.items(), saved)
+                if not ok
+            }
+            for sha, count in failed.items():
+                await self.db_session.execute(
+                    update(AudioBlob)
+                    .where(AudioBlob.id == blob_ids[sha])
+                    .values(refcount=AudioBlob.refcount - count)
+                )
+
+            created_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            rows = []
+            for index, data, spooled in spooled_items:
+                if spooled.sha256 in failed:
+                    continue
+                data["created_at"] = created_at
+                data["blob_id"] = blob_ids[spooled.sha256]
+                data["filepath"] = self.storage.locator(spooled.sha256)
+                rows.append((index, data))
+            if rows:
+                res = await self.db_session.execute(
+                    insert(AudioFile).returning(
+                        AudioFile.id, sort_by_parameter_order=True
+                    ),
+                    [data for _, data in rows],
+                )
+                for (index, data), file_id in zip(rows, res.scalars()):
+                    results[index].file = FileResponseSchema(
+                        id=file_id, **data
+                    )
+            committing = True
+            await self.db_session.commit()
+        except Exception as e:
+            if created and not committing:
+                await self._remove_created_blobs(sorted(created))
+            await self.db_session.rollback()
+            for _, _, spooled in spooled_items:
+                await discard(spooled)
+            logger.error(
+                "Failed to create AudiFile rows for a batch of %s files. "
+                "Error: %s",
+                len(files),
+                e,
+            )
+            raise
+        UPLOADS.inc(len(rows))
+        UPLOAD_BYTES.inc(sum(data["size"] or 0 for _, data in rows))
+        return BatchUploadSchema(results=results)
+
+    async def _acquire_blobs(
+        self, spooled_by_sha256: dict[str, list[SpooledUpload]]
+    ) -> tuple[dict[str, int], set[str]]:
+        """
+        Registers one reference per spooled upload to the blob of its
+        hash with a single multi-row upsert. Returns blob ids by hash and
+        the hashes whose rows were created.
+        """
+        created_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        statement = pg_insert(AudioBlob).values(
+            [
+                {
+                    "sha256": sha256,
+                    "filepath": self.storage.locator(sha256),
+                    "size": spooled[0].size,
+                    "refcount": len(spooled),
+                    "created_at": created_at,
+                }
+                # a fixed order keeps concurrent batches from deadlocking
+                for sha256, spooled in sorted(spooled_by_sha256.items())
+            ]
+        )
+        res = await self.db_session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[AudioBlob.sha256],
+                set_={
+                    "refcount": AudioBlob.refcount
+                    + statement.excluded.refcount
+                },
+            ).returning(AudioBlob.sha256, AudioBlob.id, BLOB_CREATED)
+        )
+        rows = res.all()
+        return (
+            {sha256: blob_id for sha256, blob_id, _ in rows},
+            {sha256 for sha256, _, created in rows if created},
+        )
+
+    async def acquire_blob(self, spooled: SpooledUpload) -> tuple[int, bool]:
+        """
+        Registers a reference to the blob with the spooled upload's hash,
+        creating the blob row if this content has not been stored yet.
+        Returns the blob id and whether the row was created.
+        """
+        res = await self.db_session.execute(
+            pg_insert(AudioBlob)
+            .values(
+                sha256=spooled.sha256,
+                filepath=self.storage.locator(spooled.sha256),
+                size=spooled.size,
+                refcount=1,
+                created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            )
+            .on_conflict_do_update(
+                index_elements=[AudioBlob.sha256],
+                set_={"refcount": AudioBlob.refcount + 1},
+            )
+            .returning(AudioBlob.id, BLOB_CREATED)
+        )
+        return tuple(res.one())
+
+    async def get_files_by_user(
+        self, user_id: int, filters: FileFilterSchema | None = None
+    ) -> FilePageSchema:
+        """
+        Retrieves a page of a user's audio files, filtered and sorted in
+        SQL. Pages are keyset-paginated on ``(order_by, id)``: the cursor
+        carries the sort key of the last row, so every page costs the
+        same regardless of its depth.
+        """
+        filters = filters or FileFilterSchema()
         await self.user_service.get_user_by_id(user_id)
-        res = await self.db_session.scalars(
-            select(AudioFile)
-            .options(
-                joinedload(AudioFile.owner).load_only(
-                    UserProfile.id, UserProfile.email, UserProfile.username
+        order_column = getattr(AudioFile, filters.order_by)
+        query = select(AudioFile).where(AudioFile.owner_id == user_id)
+        if filters.filename:
+            query = query.where(
+                AudioFile.filename.startswith(
+                    filters.filename, autoescape=True
+                )
+            )
+        if filters.extension:
+            query = query.where(AudioFile.extension == filters.extension)
+        if filters.created_from is not None:
+            query = query.where(AudioFile.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            query = query.where(AudioFile.created_at < filters.created_to)
+        if filters.min_duration is not None:
+            query = query.where(AudioFile.duration >= filters.min_duration)
+        if filters.max_duration is not None:
+            query = query.where(AudioFile.duration <= filters.max_duration)
+        if filters.sample_rate is not None:
+            query = query.where(AudioFile.sample_rate == filters.sample_rate)
+        if filters.channels is not None:
+            query = query.where(AudioFile.channels == filters.channels)
+        if filters.cursor:
+            value, last_id = self._decode_files_cursor(filters)
+            query = query.where(
+                keyset_after(
+                    order_column,
+                    AudioFile.id,
+                    value,
+                    last_id,
+                    descending=filters.descending,
+                    nullable=order_column.nullable,
                 )
             )
-            .where(AudioFile.owner_id == user_id)
+        if filters.descending:
+            query = query.order_by(
+                order_column.desc().nulls_last(), AudioFile.id.desc()
+            )
+        else:
+            query = query.order_by(
+                order_column.asc().nulls_last(), AudioFile.id.asc()
+            )
+        session = self.read_session or self.db_session
+        res = await session.scalars(query.limit(filters.limit + 1))
+        files = res.all()
+
+        next_cursor = None
+        if len(files) > filters.limit:
+            files = files[: filters.limit]
+            last = files[-1]
+            next_cursor = encode_cursor(
+                filters.order_by,
+                filters.descending,
+                getattr(last, filters.order_by),
+                last.id,
+            )
+        return FilePageSchema(
+            items=[
+                FileResponseSchema.model_validate(file, from_attributes=True)
+                for file in files
+            ],
+            next_cursor=next_cursor,
         )
 
-        return res.all()
+    @staticmethod
+    def _decode_files_cursor(filters: FileFilterSchema) -> tuple:
+        values = decode_cursor(filters.cursor)
+        if len(values) != 4 or values[:2] != [
+            filters.order_by,
+            filters.descending,
+        ]:
+            raise InvalidCursor("Cursor does not match the requested order")
+        value, last_id = values[2:]
+        if not _fits_integer(last_id, INTEGER_MAX):
+            raise InvalidCursor()
+        if filters.order_by == "created_at":
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise InvalidCursor()
+            if value.tzinfo is not None:
+                raise InvalidCursor()
+        elif filters.order_by == "filename":
+            if not isinstance(value, str) or "\x00" in value:
+                raise InvalidCursor()
+        elif value is None:
+            # already in the NULL tail of a nullable column
+            pass
+        elif filters.order_by == "duration":
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise InvalidCursor()
+            try:
+                value = float(value)
+            except OverflowError:
+                raise InvalidCursor()
+        elif not _fits_integer(
+            value,
+            BIGINTEGER_MAX if filters.order_by == "size" else INTEGER_MAX,
+        ):
+            raise InvalidCursor()
+        return value, last_id
+
+    async def search_files(
+        self, user_id: int, search: FileSearchSchema
+    ) -> FileSearchPageSchema:
+        """
+        Full-text search over the filenames and descriptions of a user's
+        files, best matches first. Matches are found through the GIN index
+        on ``search_vector``; only the rows of the page get highlighted,
+        as ts_headline parses the text again. Pages are keyset-paginated
+        on ``(rank, id)``.
+        """
+        terms = search_terms(search.q)
+        if not terms:
+            return FileSearchPageSchema(items=[])
+        tsquery = prefix_tsquery(terms)
+        rank = func.ts_rank_cd(AudioFile.search_vector, tsquery)
+        matches = select(AudioFile.id, rank.label("rank")).where(
+            AudioFile.owner_id == user_id,
+            AudioFile.search_vector.bool_op("@@")(tsquery),
+        )
+        if search.cursor:
+            value, last_id = self._decode_search_cursor(search.cursor, terms)
+            matches = matches.where(
+                keyset_after(rank, AudioFile.id, value, last_id, True)
+            )
+        page = (
+            matches.order_by(rank.desc(), AudioFile.id.desc())
+            .limit(search.limit + 1)
+            .subquery()
+        )
+        query = (
+            select(
+                AudioFile,
+                page.c.rank,
+                headline(AudioFile.description, tsquery),
+            )
+            .join(page, AudioFile.id == page.c.id)
+            .order_by(page.c.rank.desc(), AudioFile.id.desc())
+        )
+        session = self.read_session or self.db_session
+        rows = (await session.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > search.limit:
+            rows = rows[: search.limit]
+            last_file, last_rank, _ = rows[-1]
+            next_cursor = encode_cursor(terms, last_rank, last_file.id)
+        items = []
+        for file, file_rank, description_snippet in rows:
+            file_schema = FileResponseSchema.model_validate(
+                file, from_attributes=True
+            )
+            items.append(
+                FileSearchResultSchema(
+                    **file_schema.model_dump(),
+                    rank=file_rank,
+                    filename_highlight=highlight_filename(
+                        file.filename, terms
+                    ),
+                    description_highlight=highlight(description_snippet),
+                )
+            )
+        return FileSearchPageSchema(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    def _decode_search_cursor(cursor: str, terms: list[str]) -> tuple:
+        values = decode_cursor(cursor)
+        if len(values) != 3 or values[0] != terms:
+            raise InvalidCursor("Cursor does not match the search query")
+        rank, last_id = values[1:]
+        if (
+            isinstance(rank, bool)
+            or not isinstance(rank, (int, float))
+            or not _fits_integer(last_id, INTEGER_MAX)
+        ):
+            raise InvalidCursor()
+        try:
+            return float(rank), last_id
+        except OverflowError:
+            raise InvalidCursor()
 
     async def get_file_by_id(self, file_id: int) -> AudioFile:
         """
@@ -105,26 +623,427 @@ class AudiFileService:
             select(AudioFile).where(AudioFile.id == file_id)
         )
         if not file:
-            logging.warning(f"file not found with ID: {file_id}")
+            logger.warning("file not found with ID: %s", file_id)
+            raise FileNotFoundError_(file_id)
+        logger.debug("Successfully retrieved file with ID: %s", file_id)
+        return file
+
+    async def _get_accessible_file(
+        self, file_id: int, current_user: TokenData
+    ) -> AudioFile:
+        """
+        Loads an audio file with its blob. Users may access their own
+        files, admins any file.
+        """
+        file = await self.db_session.scalar(
+            select(AudioFile)
+            .options(joinedload(AudioFile.blob))
+            .where(AudioFile.id == file_id)
+        )
+        # release the connection before the response starts streaming
+        await self.db_session.commit()
+        if not file or (
+            file.owner_id != current_user.user_id
+            and current_user.role < Roles.ADMIN.value
+        ):
+            logger.warning("file not found with ID: %s", file_id)
             raise FileNotFoundError_(file_id)
-        logging.info(f"Successfully retrieved file with ID: {file_id}")
         return file
 
+    async def get_file_for_download(
+        self, file_id: int, current_user: TokenData
+    ) -> FileDownload:
+        """
+        Resolves where the content of an audio file is served from.
+        """
+        file = await self._get_accessible_file(file_id, current_user)
+        extension = file.extension or os.path.splitext(file.filepath)[1][1:]
+        download = FileDownload(
+            filename=f"{file.filename}.{extension}",
+            media_type=AUDIO_MEDIA_TYPES.get(extension),
+        )
+        if file.blob is None:
+            # stored before content addressing
+            download.path = file.filepath
+            return download
+        download.path = await self._recorded_path(file.blob)
+        if download.path is not None:
+            return download
+        download.url = await self.storage.url(
+            file.blob.sha256, download.filename, download.media_type
+        )
+        download.path = self.storage.local_path(file.blob.sha256)
+        return download
+
+    async def _recorded_path(self, blob: AudioBlob) -> str | None:
+        """
+        Returns the local file a blob was recorded at when that is not
+        where the current backend keeps it: blobs stored in the flat
+        ``blobs/<sha256>`` layout, or left on disk after switching to s3.
+        """
+        if blob.filepath == self.storage.locator(blob.sha256):
+            return None
+        if not await run_in_threadpool(os.path.isfile, blob.filepath):
+            return None
+        return blob.filepath
+
+    async def _build_peaks(self, file: AudioFile) -> bytes:
+        """
+        Computes the waveform peaks of a stored file in the process pool
+        and saves them next to its blob.
+        """
+        sha256 = file.blob.sha256
+        path = await self._recorded_path(file.blob)
+        if path is None:
+            path = self.storage.local_path(sha256)
+        downloaded = None
+        if path is None:
+            path = downloaded = await temporary_path()
+            await self.storage.download(sha256, path)
+        try:
+            peaks = await run_in_process(
+                compute_peaks,
+                path,
+                file.extension,
+                file.channels,
+                settings.PEAKS_RESOLUTIONS,
+            )
+        finally:
+            if downloaded:
+                await remove_file(downloaded)
+        await self.storage.save(
+            peaks_key(sha256), await write_temporary(peaks)
+        )
+        return peaks
+
+    async def generate_peaks(self, file_id: int) -> None:
+        """
+        Precomputes the waveform peaks of a new file unless its content
+        already has them.
+        """
+        file = await self.db_session.scalar(
+            select(AudioFile)
+            .options(joinedload(AudioFile.blob))
+            .where(AudioFile.id == file_id)
+        )
+        await self.db_session.commit()
+        if not file or file.blob is None:
+            return
+        if await self.storage.exists(peaks_key(file.blob.sha256)):
+            return
+        try:
+            await self._build_peaks(file)
+        except Exception as e:
+            logger.error(
+                "Failed to compute peaks of file: %s. Error: %s", file_id, e
+            )
+
+    async def get_peaks(
+        self, file_id: int, current_user: TokenData, resolution: int
+    ) -> bytes:
+        """
+        Returns the waveform of an audio file as interleaved int8
+        (min, max) pairs, at most ``resolution`` of them. Peaks missing
+        from storage (files uploaded before peaks existed, failed
+        background runs) are computed on the spot.
+        """
+        file = await self._get_accessible_file(file_id, current_user)
+        if file.blob is None:
+            raise PeaksNotAvailable(file_id)
+        try:
+            peaks = await self.storage.read(peaks_key(file.blob.sha256))
+        except FileNotFoundError:
+            try:
+                peaks = await self._build_peaks(file)
+            except ValueError as e:
+                logger.warning(
+                    "Failed to compute peaks of file: %s. Error: %s",
+                    file_id,
+                    e,
+                )
+                raise PeaksNotAvailable(file_id)
+        return read_level(peaks, resolution)
+
     async def delete_file(self, file_id: int) -> None:
-        file = await self.get_file_by_id(file_id)
+        deleted = await self.delete_files(
+            FileBulkDeleteSchema(file_ids=[file_id])
+        )
+        if not deleted:
+            logger.warning("file not found with ID: %s", file_id)
+            raise FileNotFoundError_(file_id)
+
+    async def delete_files(self, criteria: FileBulkDeleteSchema) -> int:
+        """
+        Deletes every AudioFile matching ``criteria`` and releases their
+        blobs in a single statement. The stored bytes are reclaimed later
+        by the blob garbage collector (``src.audio.tasks``), once a blob
+        is no longer referenced.
+        """
+        query = delete(AudioFile)
+        if criteria.file_ids is not None:
+            # one array parameter: an IN list binds one per id, and
+            # asyncpg allows at most 32767
+            query = query.where(
+                AudioFile.id
+                == any_(
+                    bindparam(
+                        "file_ids", criteria.file_ids, type_=ARRAY(Integer)
+                    )
+                )
+            )
+        if criteria.owner_id is not None:
+            query = query.where(AudioFile.owner_id == criteria.owner_id)
+        if criteria.extension:
+            query = query.where(AudioFile.extension == criteria.extension)
+        if criteria.created_before is not None:
+            query = query.where(AudioFile.created_at < criteria.created_before)
+        deleted = query.returning(AudioFile.blob_id).cte("deleted")
+        released = (
+            select(deleted.c.blob_id, func.count().label("references"))
+            .where(deleted.c.blob_id.is_not(None))
+            .group_by(deleted.c.blob_id)
+            .cte("released")
+        )
+        release_blobs = (
+            update(AudioBlob)
+            .where(AudioBlob.id == released.c.blob_id)
+            .values(refcount=AudioBlob.refcount - released.c.references)
+            .cte("release_blobs")
+        )
         try:
-            res = await self.db_session.execute(
-                delete(AudioFile).where(AudioFile.id == file_id)
+            count = await self.db_session.scalar(
+                select(func.count())
+                .select_from(deleted)
+                .add_cte(release_blobs)
             )
             await self.db_session.commit()
-            if res.rowcount == 0:
-                logging.error(
-                    f"file '{file_id}' was not deleted. res.rowcount != 0"
-                )
-                raise ValueError()
         except Exception as e:
             await self.db_session.rollback()
-            logging.error(
-                f"Failed to delete file: {file.id}. " f"Error: {str(e)}"
+            logger.error("Failed to delete files. Error: %s", e)
+            raise
+        logger.info("Deleted %s files", count)
+        return count
+
+
+@dataclass
+class UploadSessionService:
+    """
+    Resumable uploads: chunks of a session are stored independently and
+    assembled into an AudioFile once all of them have been received.
+    """
+
+    db_session: AsyncSession
+    audio_service: AudiFileService
+
+    @staticmethod
+    def _expires_at() -> datetime:
+        return datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(
+            minutes=settings.UPLOAD_SESSION_TTL_MINUTES
+        )
+
+    async def _get_session(
+        self,
+        session_id: str,
+        owner_id: int,
+        for_update: bool = False,
+        open_only: bool = False,
+    ) -> UploadSession:
+        query = select(UploadSession).where(
+            UploadSession.id == session_id,
+            UploadSession.owner_id == owner_id,
+            UploadSession.expires_at
+            > datetime.now(timezone.utc).replace(tzinfo=None),
+        )
+        if for_update:
+            query = query.with_for_update()
+        upload_session = await self.db_session.scalar(query)
+        if not upload_session:
+            raise UploadSessionNotFound(session_id)
+        if open_only and upload_session.completing:
+            await self.db_session.rollback()
+            raise UploadSessionCompleting(session_id)
+        return upload_session
+
+    async def _missing_chunks(
+        self, upload_session: UploadSession
+    ) -> list[int]:
+        received = await self.db_session.scalars(
+            select(UploadSessionChunk.index).where(
+                UploadSessionChunk.session_id == upload_session.id
             )
+        )
+        return sorted(
+            set(range(upload_session.chunk_count)) - set(received.all())
+        )
+
+    async def _to_schema(
+        self, upload_session: UploadSession
+    ) -> UploadSessionSchema:
+        return UploadSessionSchema(
+            id=upload_session.id,
+            filename=upload_session.filename,
+            total_size=upload_session.total_size,
+            chunk_size=upload_session.chunk_size,
+            chunk_count=upload_session.chunk_count,
+            missing_chunks=await self._missing_chunks(upload_session),
+            expires_at=upload_session.expires_at,
+        )
+
+    async def create_session(
+        self, owner_id: int, session_create: UploadSessionCreateSchema
+    ) -> UploadSessionSchema:
+        """
+        Opens an upload session for a file of ``total_size`` bytes.
+        """
+        if session_create.total_size > settings.FILE_UPLOAD_MAX_SIZE:
+            raise FileTooLarge(settings.FILE_UPLOAD_MAX_SIZE)
+        chunk_size = min(
+            session_create.chunk_size or settings.UPLOAD_SESSION_CHUNK_SIZE,
+            settings.UPLOAD_SESSION_MAX_CHUNK_SIZE,
+        )
+        upload_session = UploadSession(
+            id=str(uuid.uuid4()),
+            owner_id=owner_id,
+            filename=session_create.filename,
+            description=session_create.description,
+            extension=session_create.source_filename.split(".")[-1].lower(),
+            total_size=session_create.total_size,
+            chunk_size=chunk_size,
+            created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            expires_at=self._expires_at(),
+        )
+        try:
+            self.db_session.add(upload_session)
+            await self.db_session.commit()
+        except Exception as e:
+            await self.db_session.rollback()
+            logger.error(
+                "Failed to create upload session for user %s. Error: %s",
+                owner_id,
+                e,
+            )
+            raise
+        return UploadSessionSchema(
+            id=upload_session.id,
+            filename=upload_session.filename,
+            total_size=upload_session.total_size,
+            chunk_size=upload_session.chunk_size,
+            chunk_count=upload_session.chunk_count,
+            missing_chunks=list(range(upload_session.chunk_count)),
+            expires_at=upload_session.expires_at,
+        )
+
+    async def get_session(
+        self, session_id: str, owner_id: int
+    ) -> UploadSessionSchema:
+        """
+        Returns the state of an upload session, including the chunks that
+        still have to be uploaded.
+        """
+        upload_session = await self._get_session(session_id, owner_id)
+        return await self._to_schema(upload_session)
+
+    async def upload_chunk(
+        self,
+        session_id: str,
+        owner_id: int,
+        index: int,
+        chunks: AsyncIterator[bytes],
+    ) -> UploadChunkSchema:
+        """
+        Stores chunk ``index`` of an upload session. Chunks may arrive in any
+        order and in parallel; re-sending a chunk replaces it.
+        """
+        upload_session = await self._get_session(
+            session_id, owner_id, open_only=True
+        )
+        if not 0 <= index < upload_session.chunk_count:
+            raise UploadChunkInvalid()
+        expected_size = upload_session.expected_chunk_size(index)
+        # release the connection while the chunk streams to disk
+        await self.db_session.commit()
+
+        await save_chunk(chunks, session_id, index, expected_size)
+        try:
+            await self.db_session.execute(
+                pg_insert(UploadSessionChunk)
+                .values(session_id=session_id, index=index, size=expected_size)
+                .on_conflict_do_update(
+                    index_elements=[
+                        UploadSessionChunk.session_id,
+                        UploadSessionChunk.index,
+                    ],
+                    set_={"size": expected_size},
+                )
+            )
+            await self.db_session.execute(
+                update(UploadSession)
+                .where(UploadSession.id == session_id)
+                .values(expires_at=self._expires_at())
+            )
+            await self.db_session.commit()
+        except IntegrityError:
+            # the session was aborted or purged while the chunk streamed in
+            await self.db_session.rollback()
+            await remove_session_directory(session_id)
+            raise UploadSessionNotFound(session_id)
+        return UploadChunkSchema(index=index, size=expected_size)
+
+    async def complete(
+        self, session_id: str, owner_id: int
+    ) -> FileResponseSchema:
+        """
+        Assembles the chunks of a fully uploaded session into an AudioFile
+        and closes the session.
+
+        The session is marked as completing and committed first, so no
+        row lock or connection is held while a large file is assembled;
+        chunk uploads and other completions are rejected meanwhile.
+        """
+        upload_session = await self._get_session(
+            session_id, owner_id, for_update=True, open_only=True
+        )
+        missing_chunks = await self._missing_chunks(upload_session)
+        if missing_chunks:
+            await self.db_session.rollback()
+            raise UploadIncomplete(missing_chunks[:20])
+        data = {
+            "filename": upload_session.filename,
+            "description": upload_session.description,
+            "extension": upload_session.extension,
+            "owner_id": upload_session.owner_id,
+        }
+        chunk_count = upload_session.chunk_count
+        await self._set_completing(session_id, True)
+
+        try:
+            spooled = await assemble_chunks(session_id, chunk_count)
+            await self.db_session.execute(
+                delete(UploadSession).where(UploadSession.id == session_id)
+            )
+            file = await self.audio_service.store_spooled(data, spooled)
+        except Exception:
+            await self.db_session.rollback()
+            await self._set_completing(session_id, False)
             raise
+        await remove_session_directory(session_id)
+        return file
+
+    async def _set_completing(self, session_id: str, completing: bool) -> None:
+        await self.db_session.execute(
+            update(UploadSession)
+            .where(UploadSession.id == session_id)
+            .values(completing=completing)
+        )
+        await self.db_session.commit()
+
+    async def abort(self, session_id: str, owner_id: int) -> None:
+        """
+        Cancels an upload session and removes its chunks.
+        """
+        await self._get_session(session_id, owner_id, open_only=True)
+        await self.db_session.execute(
+            delete(UploadSession).where(UploadSession.id == session_id)
+        )
+        await self.db_session.commit()
+        await remove_session_directory(session_id)
@@ -0,0 +1,217 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from src.exceptions import FileTooLarge, UploadChunkInvalid
+from src.settings import settings
+
+TMP_DIRECTORY = "tmp"
+SESSIONS_DIRECTORY = "sessions"
+
+
+@dataclass
+class SpooledUpload:
+    """An upload received into a temporary file, with its content hash."""
+
+    path: str
+    sha256: str
+    size: int
+
+
+def _remove_silently(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_chunk(f_write, hasher, chunk: bytes) -> None:
+    hasher.update(chunk)
+    f_write.write(chunk)
+
+
+def _close(f_write) -> None:
+    f_write.flush()
+    os.fsync(f_write.fileno())
+    f_write.close()
+
+
+async def _iter_upload_file(
+    file: UploadFile, chunk_size: int
+) -> AsyncIterator[bytes]:
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def _spool(
+    chunks: AsyncIterator[bytes], directory: str, max_size: int
+) -> SpooledUpload:
+    await run_in_threadpool(os.makedirs, directory, exist_ok=True)
+    fd, tmp_path = await run_in_threadpool(
+        tempfile.mkstemp, dir=directory, suffix=".part"
+    )
+    f_write = os.fdopen(fd, "wb")
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_size:
+                raise FileTooLarge(max_size)
+            await run_in_threadpool(_write_chunk, f_write, hasher, chunk)
+        await run_in_threadpool(_close, f_write)
+    except BaseException:
+        f_write.close()
+        await run_in_threadpool(_remove_silently, tmp_path)
+        raise
+    return SpooledUpload(path=tmp_path, sha256=hasher.hexdigest(), size=size)
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_size: int | None = None,
+    chunk_size: int | None = None,
+) -> SpooledUpload:
+    """
+    Streams an uploaded file to a temporary file in bounded chunks,
+    computing its SHA-256 on the way.
+
+    Blocking file I/O and hashing run in the thread pool. The temporary file
+    lives under FILE_UPLOAD_DIRECTORY, so the local storage backend can
+    commit it with an atomic rename.
+    """
+    max_size = max_size or settings.FILE_UPLOAD_MAX_SIZE
+    chunk_size = chunk_size or settings.FILE_UPLOAD_CHUNK_SIZE
+    if file.size is not None and file.size > max_size:
+        raise FileTooLarge(max_size)
+    return await _spool(
+        _iter_upload_file(file, chunk_size),
+        os.path.join(settings.FILE_UPLOAD_DIRECTORY, TMP_DIRECTORY),
+        max_size,
+    )
+
+
+def session_directory(session_id: str) -> str:
+    """Returns the directory holding the chunks of an upload session."""
+    return os.path.join(
+        settings.FILE_UPLOAD_DIRECTORY, SESSIONS_DIRECTORY, session_id
+    )
+
+
+async def save_chunk(
+    chunks: AsyncIterator[bytes],
+    session_id: str,
+    index: int,
+    expected_size: int,
+) -> SpooledUpload:
+    """
+    Streams one chunk of an upload session to disk.
+
+    The chunk is spooled next to the other chunks of the session and renamed
+    to its index, so a retried or concurrent PUT of the same chunk simply
+    replaces it. Raises UploadChunkInvalid if the received size differs from
+    ``expected_size``.
+    """
+    directory = session_directory(session_id)
+    try:
+        spooled = await _spool(chunks, directory, expected_size)
+    except FileTooLarge:
+        raise UploadChunkInvalid(index, expected_size)
+    if spooled.size != expected_size:
+        await discard(spooled)
+        raise UploadChunkInvalid(index, expected_size)
+    await run_in_threadpool(
+        os.replace, spooled.path, os.path.join(directory, str(index))
+    )
+    return spooled
+
+
+def _concatenate(paths: list[str], target) -> tuple[str, int]:
+    hasher = hashlib.sha256()
+    size = 0
+    for path in paths:
+        with open(path, "rb") as f_read:
+            while chunk := f_read.read(settings.FILE_UPLOAD_CHUNK_SIZE):
+                hasher.update(chunk)
+                target.write(chunk)
+                size += len(chunk)
+    _close(target)
+    return hasher.hexdigest(), size
+
+
+async def _spool_files(paths: list[str]) -> SpooledUpload:
+    directory = os.path.join(settings.FILE_UPLOAD_DIRECTORY, TMP_DIRECTORY)
+    await run_in_threadpool(os.makedirs, directory, exist_ok=True)
+    fd, tmp_path = await run_in_threadpool(
+        tempfile.mkstemp, dir=directory, suffix=".part"
+    )
+    f_write = os.fdopen(fd, "wb")
+    try:
+        sha256, size = await run_in_threadpool(_concatenate, paths, f_write)
+    except BaseException:
+        f_write.close()
+        await run_in_threadpool(_remove_silently, tmp_path)
+        raise
+    return SpooledUpload(path=tmp_path, sha256=sha256, size=size)
+
+
+async def assemble_chunks(session_id: str, chunk_count: int) -> SpooledUpload:
+    """
+    Concatenates the chunks of an upload session into a spooled upload,
+    computing its SHA-256 on the way. Runs in the thread pool.
+    """
+    directory = session_directory(session_id)
+    return await _spool_files(
+        [os.path.join(directory, str(index)) for index in range(chunk_count)]
+    )
+
+
+async def spool_local_file(path: str) -> SpooledUpload:
+    """Copies a local file into a spooled upload, computing its SHA-256."""
+    return await _spool_files([path])
+
+
+async def remove_session_directory(session_id: str) -> None:
+    """Removes every chunk stored for an upload session."""
+    await run_in_threadpool(
+        shutil.rmtree, session_directory(session_id), ignore_errors=True
+    )
+
+
+async def temporary_path() -> str:
+    """Creates an empty temporary file under FILE_UPLOAD_DIRECTORY."""
+    directory = os.path.join(settings.FILE_UPLOAD_DIRECTORY, TMP_DIRECTORY)
+    await run_in_threadpool(os.makedirs, directory, exist_ok=True)
+    fd, tmp_path = await run_in_threadpool(
+        tempfile.mkstemp, dir=directory, suffix=".part"
+    )
+    os.close(fd)
+    return tmp_path
+
+
+def _write(path: str, data: bytes) -> None:
+    f_write = open(path, "wb")
+    f_write.write(data)
+    _close(f_write)
+
+
+async def write_temporary(data: bytes) -> str:
+    """Writes ``data`` to a new temporary file and returns its path."""
+    tmp_path = await temporary_path()
+    await run_in_threadpool(_write, tmp_path, data)
+    return tmp_path
+
+
+async def remove_file(path: str) -> None:
+    await run_in_threadpool(_remove_silently, path)
+
+
+async def discard(spooled: SpooledUpload) -> None:
+    """Removes the temporary file of a spooled upload, if still present."""
+    await run_in_threadpool(_remove_silently, spooled.path)
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, exists, select
+
+from src.audio.models import AudioBlob, AudioFile, UploadSession
+from src.audio.peaks import peaks_key
+from src.audio.service import AudiFileService
+from src.audio.storage import remove_session_directory
+from src.infra.db_accessor import db_config
+from src.infra.storage import get_storage
+from src.settings import settings
+from src.users.service import UserService
+
+logger = logging.getLogger(__name__)
+
+
+async def generate_peaks(*file_ids: int) -> None:
+    """
+    Precomputes the waveform peaks of new files. Runs after the upload
+    response has been sent, with a session of its own.
+    """
+    async with db_config.AsyncSession_() as session:
+        audio_service = AudiFileService(
+            db_session=session, user_service=UserService(db_session=session)
+        )
+        for file_id in file_ids:
+            await audio_service.generate_peaks(file_id)
+
+
+async def collect_garbage_blobs() -> int:
+    """
+    Removes blobs no AudioFile references any more, together with their
+    peaks. Works in batches of BLOB_GC_BATCH_SIZE and sleeps between them
+    to stay under BLOB_GC_MAX_DELETES_PER_SECOND (0 for no limit).
+
+    Batches are claimed with FOR UPDATE SKIP LOCKED: an upload of the same
+    content blocks on the claimed row until it is gone and then stores a
+    fresh copy, and several workers never collect the same blob.
+    """
+    storage = get_storage()
+    rate = settings.BLOB_GC_MAX_DELETES_PER_SECOND
+    delay = 1 / rate if rate > 0 else 0
+    collected = 0
+    while True:
+        async with db_config.AsyncSession_() as session:
+            blobs = (
+                await session.execute(
+                    select(AudioBlob.id, AudioBlob.sha256)
+                    .where(
+                        AudioBlob.refcount <= 0,
+                        ~exists().where(AudioFile.blob_id == AudioBlob.id),
+                    )
+                    .order_by(AudioBlob.id)
+                    .limit(settings.BLOB_GC_BATCH_SIZE)
+                    .with_for_update(skip_locked=True)
+                )
+            ).all()
+            if not blobs:
+                return collected
+            await storage.delete_many(
+                [sha256 for _, sha256 in blobs]
+                + [peaks_key(sha256) for _, sha256 in blobs]
+            )
+            await session.execute(
+                delete(AudioBlob).where(
+                    AudioBlob.id.in_([blob_id for blob_id, _ in blobs])
+                )
+            )
+            await session.commit()
+        collected += len(blobs)
+        logger.info("Collected %s unreferenced blobs", len(blobs))
+        if delay:
+            await asyncio.sleep(len(blobs) * delay)
+
+
+async def run_blob_collector():
+    """Periodically reclaims the storage of deleted files."""
+    while True:
+        try:
+            await collect_garbage_blobs()
+        except Exception as e:
+            logger.error("Failed to collect blobs. Error: %s", e)
+        await asyncio.sleep(settings.BLOB_GC_INTERVAL_SECONDS)
+
+
+async def purge_expired_upload_sessions() -> int:
+    """
+    Deletes upload sessions that have not received a chunk within
+    UPLOAD_SESSION_TTL_MINUTES, together with their chunks on disk.
+    """
+    async with db_config.AsyncSession_() as session:
+        res = await session.execute(
+            delete(UploadSession)
+            .where(
+                UploadSession.expires_at
+                < datetime.now(timezone.utc).replace(tzinfo=None)
+            )
+            .returning(UploadSession.id)
+        )
+        expired = res.scalars().all()
+        await session.commit()
+    for session_id in expired:
+        await remove_session_directory(session_id)
+    if expired:
+        logger.info("Purged %s expired upload sessions", len(expired))
+    return len(expired)
+
+
+async def run_upload_session_janitor():
+    """Periodically purges abandoned upload sessions."""
+    while True:
+        try:
+            await purge_expired_upload_sessions()
+        except Exception as e:
+            logger.error("Failed to purge upload sessions. Error: %s", e)
+        await asyncio.sleep(settings.UPLOAD_SESSION_CLEANUP_INTERVAL_SECONDS)
@@ -1,21 +1,31 @@
 import logging
 from dataclasses import dataclass
-
-import httpx
+from typing import TYPE_CHECKING, Callable
 
 from src.auth.schemas import YandexUserData
 from src.exceptions import YandexAuthenticationError
 from src.settings import settings
 
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class YandexClient:
-    async_client: httpx.AsyncClient
+    # resolved on each call: building the shared client imports httpx,
+    # which only Yandex logins need
+    get_async_client: Callable[[], "httpx.AsyncClient"]
+
+    @property
+    def async_client(self) -> "httpx.AsyncClient":
+        return self.get_async_client()
 
     async def get_user_info(self, code: str) -> YandexUserData:
         try:
             access_token = await self._get_user_access_token(code=code)
-            logging.info(f"Got Yandex access_token: {access_token}")
+            logger.debug("Got Yandex access token")
 
             user_info = await self.async_client.get(
                 "https://login.yandex.ru/info?format=json",
@@ -25,7 +35,7 @@ class YandexClient:
                 **user_info.json(), access_token=access_token
             )
         except Exception as e:
-            logging.error(f"Error request to Yandex API. Error: {str(e)}")
+            logger.error("Error request to Yandex API. Error: %s", e)
             raise YandexAuthenticationError(str(e))
 
     async def _get_user_access_token(self, code: str) -> str:
@@ -41,5 +51,5 @@ class YandexClient:
                 "Content-Type": "application/x-www-form-urlencoded",
             },
         )
-        logging.info(f"Got response from Yandex: {response.json()}")
+        logger.debug("Got Yandex token response: %s", response.status_code)
         return response.json()["access_token"]
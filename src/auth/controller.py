@@ -1,4 +1,3 @@
-import logging
 from typing import Annotated
 
 from fastapi import APIRouter, Depends
@@ -11,6 +10,7 @@ from src.auth.schemas import (
     YandexAccessResponse,
 )
 from src.auth.service import AuthService
+from src.auth.throttling import admit_login, throttle_by_ip
 from src.dependencies import (
     Token,
     get_auth_service,
@@ -20,7 +20,9 @@ from src.dependencies import (
 from src.users.schemas import UserResponseSchema
 from src.users.service import UserService
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
+router = APIRouter(
+    prefix="/auth", tags=["Auth"], dependencies=[Depends(throttle_by_ip)]
+)
 
 
 @router.post("/token", response_model=TokenSchema)
@@ -28,7 +30,8 @@ async def login(
     form_data: BaseAuth,
     auth_service: Annotated[AuthService, Depends(get_auth_service)],
 ):
-    return await auth_service.login(form_data)
+    async with admit_login(form_data.email):
+        return await auth_service.login(form_data)
 
 
 @router.post("/refresh", response_model=TokenSchema)
@@ -62,5 +65,4 @@ async def yandex_callback(
     auth_service: Annotated[AuthService, Depends(get_auth_service)],
     code: str,
 ):
-    logging.info(f"Yandex access token: {code}")
     return await auth_service.yandex_auth(code)
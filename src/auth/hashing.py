@@ -0,0 +1,102 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from src.monitoring.metrics import PASSWORD_HASH_DURATION
+from src.settings import settings
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords with bcrypt off the event loop.
+
+    bcrypt releases the GIL, so a small dedicated thread pool gives real
+    parallelism. PASSWORD_HASH_WORKERS caps how many hashes run at once;
+    further requests queue instead of stalling the loop or crowding out
+    the default thread pool used for file I/O.
+    """
+
+    def __init__(self, rounds: int, max_workers: int):
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self._context = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def context(self):
+        if self._context is None:
+            # imported on first use, like in warm_up: passlib is slow to
+            # import
+            from passlib.context import CryptContext
+
+            self._context = CryptContext(
+                schemes=["bcrypt"],
+                deprecated="auto",
+                bcrypt__rounds=self.rounds,
+            )
+        return self._context
+
+    def warm_up(self) -> None:
+        """Loads passlib ahead of the first login."""
+        self.context
+        self._get_executor()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hasher",
+            )
+        return self._executor
+
+    @staticmethod
+    def _timed(operation: str, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            PASSWORD_HASH_DURATION.labels(operation).observe(
+                time.perf_counter() - started
+            )
+
+    async def _run(self, operation: str, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), partial(self._timed, operation, func, *args)
+        )
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.context.hash, password)
+
+    async def verify_and_update(
+        self, password: str, password_hash: str | None
+    ) -> tuple[bool, str | None]:
+        """
+        Checks ``password`` against ``password_hash``. If it matches but
+        the hash was made with other cost parameters than the current
+        ones (BCRYPT_ROUNDS), also returns a new hash to store in its
+        place; otherwise the second item is None.
+        """
+        if not password_hash:
+            return False, None
+        return await self._run(
+            "verify", self.context.verify_and_update, password, password_hash
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _forget_executor(self) -> None:
+        # threads do not survive fork; the child starts its own on demand
+        self._executor = None
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+)
+os.register_at_fork(after_in_child=password_hasher._forget_executor)
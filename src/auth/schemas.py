@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 from src.users.models import Roles
 
@@ -11,6 +11,9 @@ class TokenSchema(BaseModel):
 
 
 class TokenData(BaseModel):
+    # instances are shared through the token cache
+    model_config = ConfigDict(frozen=True)
+
     user_id: int | None = None
     username: str | None = None
     email: str | None = None
@@ -2,26 +2,28 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
-from jose import ExpiredSignatureError, JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.client import YandexClient
+from src.auth.hashing import password_hasher
 from src.auth.schemas import (
     BaseAuth,
     TokenData,
     TokenSchema,
     YandexAccessResponse,
 )
+from src.auth.tokens import decode_access_token
 from src.exceptions import (
-    AuthenticationError,
     UserNotCorrectPasswordException,
     UserNotFoundError,
 )
 from src.settings import settings
 from src.users.models import Roles, UserProfile
 from src.users.schemas import UserCreateSchema
-from src.users.service import UserService, bcrypt_context
+from src.users.service import UserService
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -36,19 +38,9 @@ class AuthService:
     user_service: UserService
 
     def get_yandex_redirect_url(self):
-        logging.info(f"yandex_redirect_url: {settings.yandex_redirect_url}")
+        logger.debug("yandex_redirect_url: %s", settings.yandex_redirect_url)
         return settings.yandex_redirect_url
 
-    @staticmethod
-    def _validate_auth_user(user: UserProfile | None, password: str) -> None:
-        if not user:
-            raise UserNotFoundError()
-        if not bcrypt_context.verify(password, user.password_hash):
-            logging.warning(
-                f"Failed authentication attempt for email: {user.email}"
-            )
-            raise UserNotCorrectPasswordException()
-
     def generate_access_token(
         self,
         email: str,
@@ -58,6 +50,8 @@ class AuthService:
         expires_delta: timedelta,
     ) -> str:
         """Generates an access token (JWT) for a user."""
+        from jose import jwt
+
         payload = {
             "sub": email,
             "user_id": user_id,
@@ -73,34 +67,33 @@ class AuthService:
         )
 
     def _verify_token(self, token: str) -> TokenData:
-        try:
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=settings.ALGORITHM
-            )
-            user_id: int = int(payload.get("user_id"))
-            username: str = payload.get("username")
-            email: str = payload.get("email")
-            role: int = payload.get("role", Roles.SIMPLE_USER)
-            return TokenData(
-                user_id=user_id,
-                username=username,
-                email=email,
-                role=role,
-            )
-        except ExpiredSignatureError:
-            raise AuthenticationError("Token expired!")
-        except JWTError as e:
-            logging.warning(f"Token verification failed: {str(e)}")
-            raise AuthenticationError(str(e))
+        return decode_access_token(token)
 
     async def authenticate_user(self, email: str, password: str):
         """
-        Authenticates a user by checking their email and password.
+        Authenticates a user by checking their email and password. The
+        password is verified once, in the hashing thread pool; a hash made
+        with outdated cost parameters is replaced on the way.
         """
         user = await self.db_session.scalar(
             select(UserProfile).where(UserProfile.email == email)
         )
-        self._validate_auth_user(user, password)
+        # release the connection while bcrypt runs
+        await self.db_session.commit()
+        if not user:
+            raise UserNotFoundError()
+        valid, new_hash = await password_hasher.verify_and_update(
+            password, user.password_hash
+        )
+        if not valid:
+            logger.warning(
+                "Failed authentication attempt for email: %s", user.email
+            )
+            raise UserNotCorrectPasswordException()
+        if new_hash:
+            user.password_hash = new_hash
+            await self.db_session.commit()
+            logger.info("Rehashed password of user: %s", user.email)
         return user
 
     async def login(
@@ -115,7 +108,6 @@ class AuthService:
             form_data.email, form_data.password
         )
 
-        self._validate_auth_user(user, form_data.password)
         access_token = self.generate_access_token(
             user_id=user.id,
             username=user.username,
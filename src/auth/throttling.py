@@ -0,0 +1,192 @@
+"""
+Admission control for the auth endpoints.
+
+Password logins are CPU-bound (bcrypt), so a burst of them can starve the
+rest of the API. Requests are rejected early with 429 and Retry-After
+rather than queued:
+
+- every auth request takes a token from a per-IP bucket;
+- logins also take one from a per-email bucket;
+- at most LOGIN_MAX_CONCURRENT password verifications run per process.
+
+Buckets live in process memory by default, or in Redis
+(THROTTLE_BACKEND=redis) to be shared by all workers.
+"""
+
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator
+
+from fastapi import Request
+
+from src.exceptions import TooManyRequests
+from src.infra.redis_client import get_redis
+from src.monitoring.metrics import AUTH_THROTTLE
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter(ABC):
+    """Token buckets refilled at ``rate`` tokens per second."""
+
+    @abstractmethod
+    async def hit(self, key: str, rate: float, burst: int) -> float:
+        """
+        Takes a token from the bucket ``key``, which holds at most
+        ``burst`` tokens and is refilled at ``rate`` > 0 tokens per
+        second. Returns 0 if one was available, otherwise the number of
+        seconds until there is one.
+        """
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """
+    Buckets of one process. The least recently used buckets are dropped
+    beyond ``max_keys``; a dropped bucket is simply full again.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def hit(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated_at) * rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+# KEYS[1]: bucket, ARGV: rate, burst. Uses the Redis clock so that all
+# workers agree on time. Returns the seconds to wait as a string.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or burst
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens),
+           'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Buckets shared by every worker through Redis, updated atomically by a
+    Lua script. If Redis is unreachable requests are let through: an
+    outage must not lock everyone out.
+    """
+
+    def __init__(self, redis, prefix: str = "throttle:"):
+        self.redis = redis
+        self.prefix = prefix
+        self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def hit(self, key: str, rate: float, burst: int) -> float:
+        try:
+            retry_after = await self._script(
+                keys=[self.prefix + key], args=[rate, burst]
+            )
+        except Exception as e:
+            logger.error("Rate limiter unavailable. Error: %s", e)
+            return 0.0
+        return float(retry_after)
+
+
+@lru_cache
+def get_rate_limiter() -> RateLimiter:
+    """Returns the rate limiter selected by THROTTLE_BACKEND."""
+    if settings.THROTTLE_BACKEND == "redis":
+        return RedisRateLimiter(get_redis())
+    return InMemoryRateLimiter(max_keys=settings.THROTTLE_MAX_KEYS)
+
+
+class ConcurrencyLimiter:
+    """Admits at most ``limit`` callers at a time and rejects the rest."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        if self.in_flight >= self.limit:
+            AUTH_THROTTLE.labels("rejected_concurrency").inc()
+            raise TooManyRequests(retry_after=1)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+
+password_verifications = ConcurrencyLimiter(settings.LOGIN_MAX_CONCURRENT)
+
+
+async def _take(key: str, rate: float, burst: int, reason: str) -> None:
+    if rate <= 0:
+        # 0 disables the limit
+        return
+    retry_after = await get_rate_limiter().hit(key, rate, burst)
+    if retry_after > 0:
+        AUTH_THROTTLE.labels(reason).inc()
+        raise TooManyRequests(retry_after=math.ceil(retry_after))
+
+
+def _client_ip(request: Request) -> str:
+    """
+    The peer address, or the X-Forwarded-For client when the peer is one
+    of the proxies in FORWARDED_ALLOW_IPS (rewritten by uvicorn).
+    """
+    return request.client.host if request.client else "unknown"
+
+
+async def throttle_by_ip(request: Request) -> None:
+    """Router dependency: per-IP token bucket for every auth request."""
+    await _take(
+        f"ip:{_client_ip(request)}",
+        settings.AUTH_IP_RATE,
+        settings.AUTH_IP_BURST,
+        "rejected_ip",
+    )
+
+
+@asynccontextmanager
+async def admit_login(email: str) -> AsyncIterator[None]:
+    """
+    Admits a password login: takes a token from the bucket of ``email``
+    and a slot among the concurrent password verifications.
+    """
+    await _take(
+        f"login:{email.lower()}",
+        settings.LOGIN_EMAIL_RATE,
+        settings.LOGIN_EMAIL_BURST,
+        "rejected_email",
+    )
+    async with password_verifications.admit():
+        AUTH_THROTTLE.labels("admitted").inc()
+        yield
@@ -0,0 +1,69 @@
+import hashlib
+import logging
+
+from src.auth.schemas import TokenData
+from src.exceptions import AuthenticationError
+from src.infra.cache import TTLCache
+from src.settings import settings
+from src.users.models import Roles
+
+logger = logging.getLogger(__name__)
+
+# verified claims by token digest, each kept until the token's exp
+token_cache = TTLCache(max_size=settings.TOKEN_CACHE_MAX_SIZE, name="token")
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def decode_access_token(token: str) -> TokenData:
+    """
+    Verifies the signature and expiry of an access token (JWT) and returns
+    its claims. Pure CPU: needs no database session or HTTP client.
+
+    Verified claims are cached until the token expires, so a token seen
+    before costs a hash and a dict lookup.
+    """
+    key = _digest(token)
+    token_data = token_cache.get(key)
+    if token_data is not None:
+        return token_data
+    # imported on first use, like in warm_up: python-jose is slow to import
+    from jose import ExpiredSignatureError, JWTError, jwt
+
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=settings.ALGORITHM
+        )
+        user_id: int = int(payload.get("user_id"))
+        username: str = payload.get("username")
+        email: str = payload.get("email")
+        role: int = payload.get("role", Roles.SIMPLE_USER)
+        token_data = TokenData(
+            user_id=user_id,
+            username=username,
+            email=email,
+            role=role,
+        )
+        if "exp" in payload:
+            token_cache.set(key, token_data, float(payload["exp"]))
+        return token_data
+    except ExpiredSignatureError:
+        raise AuthenticationError("Token expired!")
+    except JWTError as e:
+        logger.warning("Token verification failed: %s", e)
+        raise AuthenticationError(str(e))
+
+
+def evict_access_token(token: str) -> None:
+    """
+    Drops a token from the claim cache. Call it when a token is revoked,
+    so the next request re-verifies it instead of using cached claims.
+    """
+    token_cache.delete(_digest(token))
+
+
+def warm_up() -> None:
+    """Imports the JWT library ahead of the first request that needs it."""
+    import jose.jwt  # noqa: F401
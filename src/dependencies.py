@@ -1,46 +1,74 @@
-from typing import Annotated
+from functools import partial
+from typing import Annotated, AsyncGenerator
 
-import httpx
-from fastapi import Depends, Security
+from fastapi import Depends, Request, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.audio.service import AudiFileService
+from src.audio.service import AudiFileService, UploadSessionService
 from src.auth.client import YandexClient
 from src.auth.schemas import TokenData
 from src.auth.service import AuthService
+from src.auth.tokens import decode_access_token
 from src.infra.db_accessor import db_config
+from src.infra.http_client import get_http_client
 from src.users.service import UserService
 
 reusable_oauth2 = HTTPBearer()
 Token = Annotated[HTTPAuthorizationCredentials, Security(reusable_oauth2)]
 
 
+async def get_read_session(
+    db_session: Annotated[AsyncSession, Depends(db_config.get_db)],
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to provide a session for reads that tolerate replication
+    lag: on the replica if there is one, else the request's session.
+    """
+    if db_config.ReadSession_ is None:
+        yield db_session
+        return
+    async with db_config.ReadSession_() as session:
+        yield session
+
+
 async def get_user_service(
-    db_session: AsyncSession = Depends(db_config.get_db),
+    db_session: Annotated[AsyncSession, Depends(db_config.get_db)],
+    read_session: Annotated[AsyncSession, Depends(get_read_session)],
 ) -> UserService:
     """Dependency to provide a UserService instance."""
-    return UserService(db_session=db_session)
+    return UserService(db_session=db_session, read_session=read_session)
 
 
 async def get_audio_service(
     db_session: Annotated[AsyncSession, Depends(db_config.get_db)],
+    read_session: Annotated[AsyncSession, Depends(get_read_session)],
     user_service: Annotated[UserService, Depends(get_user_service)],
 ) -> AudiFileService:
     """Dependency to provide an AudiFileService instance."""
-    return AudiFileService(db_session=db_session, user_service=user_service)
+    return AudiFileService(
+        db_session=db_session,
+        read_session=read_session,
+        user_service=user_service,
+    )
 
 
-async def get_async_client() -> httpx.AsyncClient:
-    """Provides an HTTP client for async requests."""
-    return httpx.AsyncClient()
+async def get_upload_session_service(
+    db_session: Annotated[AsyncSession, Depends(db_config.get_db)],
+    audio_service: Annotated[AudiFileService, Depends(get_audio_service)],
+) -> UploadSessionService:
+    """Dependency to provide an UploadSessionService instance."""
+    return UploadSessionService(
+        db_session=db_session, audio_service=audio_service
+    )
 
 
-async def get_yandex_client(
-    async_client: Annotated[httpx.AsyncClient, Depends(get_async_client)],
-) -> YandexClient:
-    """Dependency to provide a YandexClient instance."""
-    return YandexClient(async_client=async_client)
+async def get_yandex_client(request: Request) -> YandexClient:
+    """
+    Dependency to provide a YandexClient instance on the app-wide HTTP
+    client.
+    """
+    return YandexClient(get_async_client=partial(get_http_client, request.app))
 
 
 async def get_auth_service(
@@ -56,9 +84,9 @@ async def get_auth_service(
     )
 
 
-async def get_current_user(
-    auth_service: Annotated[AuthService, Depends(get_auth_service)],
-    token: HTTPAuthorizationCredentials = Security(reusable_oauth2),
-) -> TokenData:
-    """Retrieves the currently authenticated user from the token."""
-    return auth_service._verify_token(token.credentials)
+async def get_current_user(token: Token) -> TokenData:
+    """
+    Retrieves the currently authenticated user from the token. Stateless:
+    routes that never query the database do not check out a session.
+    """
+    return decode_access_token(token.credentials)
@@ -58,6 +58,100 @@ class FileNotFoundError_(FileError):
         super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=message)
 
 
+class FileTooLarge(FileError):
+    def __init__(self, max_size=None):
+        message = (
+            "File is too large"
+            if max_size is None
+            else f"File exceeds the maximum allowed size of {max_size} bytes"
+        )
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=message,
+        )
+
+
+class UploadSessionNotFound(FileError):
+    def __init__(self, session_id=None):
+        message = (
+            "upload session not found"
+            if session_id is None
+            else f"upload session '{session_id}' not found"
+        )
+        super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+
+
+class UploadChunkInvalid(FileError):
+    def __init__(self, index=None, expected_size=None):
+        message = (
+            "Invalid chunk"
+            if index is None
+            else f"Chunk {index} must be exactly {expected_size} bytes"
+        )
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=message
+        )
+
+
+class UploadSessionCompleting(FileError):
+    def __init__(self, session_id=None):
+        message = (
+            "upload session is being completed"
+            if session_id is None
+            else f"upload session '{session_id}' is being completed"
+        )
+        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=message)
+
+
+class UploadIncomplete(FileError):
+    def __init__(self, missing_chunks=None):
+        message = (
+            "Upload is not complete"
+            if not missing_chunks
+            else f"Upload is missing chunks: {missing_chunks}"
+        )
+        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=message)
+
+
+class BatchTooLarge(FileError):
+    def __init__(self, max_files=None):
+        message = (
+            "Too many files in batch"
+            if max_files is None
+            else f"At most {max_files} files can be uploaded in one batch"
+        )
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=message,
+        )
+
+
+class InvalidCursor(FileError):
+    def __init__(self, message: str = "Invalid pagination cursor"):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=message
+        )
+
+
+class PeaksNotAvailable(FileError):
+    def __init__(self, file_id=None):
+        message = (
+            "Waveform not available"
+            if file_id is None
+            else f"Waveform of file {file_id} not available"
+        )
+        super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+
+
+class TooManyRequests(HTTPException):
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 class UserNotCorrectPasswordException(HTTPException):
     def __init__(self, message: str = "User not correct password"):
         super().__init__(
@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from src.monitoring.metrics import CACHE_REQUESTS
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache whose entries carry their own expiry time.
+
+    Expired entries are never returned: they are dropped when looked up,
+    and least recently used entries are evicted once ``max_size`` is
+    reached. Hit and miss counters are kept for monitoring, and exported
+    under ``name``. A forked child keeps the entries with a fresh lock.
+    """
+
+    def __init__(self, max_size: int, name: str = "default"):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._hit_metric = CACHE_REQUESTS.labels(name, "hit")
+        self._miss_metric = CACHE_REQUESTS.labels(name, "miss")
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        _caches.add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self._hit_metric.inc()
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            self._miss_metric.inc()
+            return None
+
+    def set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        """Stores ``value`` until the UNIX timestamp ``expires_at``."""
+        if self.max_size <= 0 or expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+
+_caches: "weakref.WeakSet[TTLCache]" = weakref.WeakSet()
+
+
+def _reset_locks_in_child() -> None:
+    # a lock held by another thread at fork time would never be released
+    for cache in _caches:
+        cache._lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_locks_in_child)
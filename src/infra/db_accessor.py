@@ -1,34 +1,205 @@
+import asyncio
+import os
+import time
+from dataclasses import asdict, dataclass
 from typing import AsyncGenerator
 
+from sqlalchemy import exc, text
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from src.monitoring.metrics import (
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_TIMEOUTS,
+    instrument_engine,
+)
+from src.monitoring.profiling import trace_queries
 from src.settings import settings
 
+CONNECT_ARGS = {
+    # asyncpg's own cache and SQLAlchemy's prepared statements;
+    # set to 0 behind pgbouncer in transaction mode
+    "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+}
+
+
+def _database_url(host: str, port: int) -> str:
+    return (
+        f"postgresql+asyncpg://{settings.POSTGRES_USER}:"
+        f"{settings.POSTGRES_PASSWORD}@{host}:{port}/{settings.POSTGRES_DB}"
+    )
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0
+    wait_seconds_max: float = 0
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long checkouts take, including waiting
+    for a free connection and opening or pinging one.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            DB_POOL_TIMEOUTS.labels(self.logging_name).inc()
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            DB_POOL_CHECKOUT_WAIT.labels(self.logging_name).observe(waited)
+            self.stats.checkouts += 1
+            self.stats.wait_seconds_total += waited
+            self.stats.wait_seconds_max = max(
+                self.stats.wait_seconds_max, waited
+            )
+
+    def status_dict(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            **asdict(self.stats),
+        }
+
+
+def create_engine(url: str, name: str) -> AsyncEngine:
+    """
+    Creates an engine with the pool configured by the DB_* settings.
+    ``name`` labels its pool in logs and metrics.
+    """
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_logging_name=name,
+        connect_args=CONNECT_ARGS,
+    )
+    instrument_engine(engine, name)
+    trace_queries(engine)
+    return engine
+
 
 class DBConfig:
     """Handles database configuration and provides async session management."""
 
-    DATABASE_URL = f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"  # noqa E501
-    engine = create_async_engine(DATABASE_URL, echo=True)
-    AsyncSession_ = async_sessionmaker(
-        bind=engine,
-        expire_on_commit=False,
-        autoflush=False,
-        autocommit=False,
+    DATABASE_URL = _database_url(
+        settings.POSTGRES_HOST, settings.POSTGRES_PORT
     )
 
+    def __init__(self):
+        self.engine = create_engine(self.DATABASE_URL, "primary")
+        self.AsyncSession_ = self._sessionmaker(self.engine)
+        # reads that tolerate replication lag, when a replica is configured
+        self.read_engine = None
+        self.ReadSession_ = None
+        if settings.POSTGRES_REPLICA_HOST:
+            self.read_engine = create_engine(
+                _database_url(
+                    settings.POSTGRES_REPLICA_HOST,
+                    settings.POSTGRES_REPLICA_PORT or settings.POSTGRES_PORT,
+                ),
+                "replica",
+            )
+            self.ReadSession_ = self._sessionmaker(self.read_engine)
+        # health checks, created on the first ping
+        self.ping_engine = None
+
+    @staticmethod
+    def _sessionmaker(engine: AsyncEngine) -> async_sessionmaker:
+        return async_sessionmaker(
+            bind=engine,
+            expire_on_commit=False,
+            autoflush=False,
+            autocommit=False,
+        )
+
     async def get_db(self) -> AsyncGenerator[AsyncSession, None]:
         """Provides an async database session."""
         async with self.AsyncSession_() as session:
             yield session
 
+    async def warm_up(self, connections: int) -> None:
+        """
+        Opens up to ``connections`` connections per engine ahead of the
+        first requests; they stay in the pool.
+        """
+        for engine in (self.engine, self.read_engine):
+            if engine is None:
+                continue
+            count = min(connections, settings.DB_POOL_SIZE)
+            opened = await asyncio.gather(
+                *(engine.connect() for _ in range(count))
+            )
+            for connection in opened:
+                await connection.execute(text("SELECT 1"))
+                await connection.close()
+
+    async def ping(self) -> None:
+        """
+        Runs a query on a connection of its own: a busy worker that has
+        every pooled connection checked out still reaches the database.
+        """
+        if self.ping_engine is None:
+            self.ping_engine = create_async_engine(
+                self.DATABASE_URL,
+                pool_size=1,
+                max_overflow=0,
+                pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+                connect_args=CONNECT_ARGS,
+            )
+        async with self.ping_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    async def dispose(self) -> None:
+        """Closes the pooled connections of every engine."""
+        for engine in (self.engine, self.read_engine, self.ping_engine):
+            if engine is not None:
+                await engine.dispose()
+
+    def _forget_connections(self) -> None:
+        """
+        Gives a forked child empty pools, leaving the inherited connections
+        to the parent.
+        """
+        for engine in (self.engine, self.read_engine, self.ping_engine):
+            if engine is not None:
+                engine.sync_engine.dispose(close=False)
+
+    def pool_stats(self) -> dict:
+        """Returns live pool statistics by engine."""
+        stats = {"primary": self.engine.pool.status_dict()}
+        if self.read_engine is not None:
+            stats["replica"] = self.read_engine.pool.status_dict()
+        return stats
+
 
 db_config = DBConfig()
+os.register_at_fork(after_in_child=db_config._forget_connections)
 
 
 class Base(DeclarativeBase):
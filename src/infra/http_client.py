@@ -0,0 +1,48 @@
+from typing import TYPE_CHECKING
+
+from fastapi import FastAPI
+
+from src.settings import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+
+def create_http_client() -> "httpx.AsyncClient":
+    """
+    Creates the HTTP client shared by the whole app for outgoing requests
+    (Yandex OAuth). Connections are pooled and kept alive between
+    requests, and multiplexed over HTTP/2 where the server supports it.
+    """
+    # imported on first use: most workers never make outgoing requests
+    import httpx
+
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(
+            settings.HTTP_CLIENT_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=(
+                settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+def get_http_client(app: FastAPI) -> "httpx.AsyncClient":
+    """Returns the shared HTTP client of ``app``, created on first use."""
+    client = getattr(app.state, "http_client", None)
+    if client is None:
+        client = app.state.http_client = create_http_client()
+    return client
+
+
+async def close_http_client(app: FastAPI) -> None:
+    client = getattr(app.state, "http_client", None)
+    if client is not None:
+        app.state.http_client = None
+        await client.aclose()
@@ -0,0 +1,61 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # imported lazily: spawned workers import this module too
+        from src.settings import settings
+
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.PROCESS_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+async def warm_up_process_pool() -> None:
+    """
+    Starts every worker of the pool, so the first requests do not pay for
+    spawning interpreters.
+    """
+    from src.settings import settings
+
+    await asyncio.gather(
+        *(
+            run_in_process(os.getpid)
+            for _ in range(settings.PROCESS_POOL_WORKERS)
+        )
+    )
+
+
+async def run_in_process(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Runs CPU-bound ``func`` in the shared process pool, keeping it off the
+    event loop and out of the GIL. ``func`` and its arguments must be
+    picklable.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), func, *args)
+
+
+def _forget_pool_in_child() -> None:
+    # the pool's management thread and pipes belong to the parent
+    global _pool
+    _pool = None
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+os.register_at_fork(after_in_child=_forget_pool_in_child)
@@ -0,0 +1,26 @@
+from functools import lru_cache
+
+from src.settings import settings
+
+
+@lru_cache
+def get_redis():
+    """
+    Returns the Redis client shared by the process. Requires the ``redis``
+    extra and REDIS_URL.
+    """
+    # imported on first use: only the redis backends need it
+    try:
+        from redis import asyncio as aioredis
+    except ImportError:
+        raise RuntimeError(
+            "The redis backend requires redis: "
+            "install audio_manager with the 'redis' extra"
+        )
+    if not settings.REDIS_URL:
+        raise RuntimeError("The redis backend requires REDIS_URL")
+    return aioredis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=settings.REDIS_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_TIMEOUT_SECONDS,
+    )
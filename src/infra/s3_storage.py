@@ -0,0 +1,133 @@
+import os
+from urllib.parse import quote
+
+from starlette.concurrency import run_in_threadpool
+
+from src.infra.storage import StorageBackend, shard_key
+from src.settings import settings
+
+# DeleteObjects accepts at most 1000 keys per request
+S3_DELETE_BATCH_SIZE = 1000
+
+try:
+    import boto3
+    from botocore.exceptions import ClientError
+except ImportError:  # pragma: no cover
+    boto3 = None
+
+
+class S3StorageBackend(StorageBackend):
+    """
+    Stores blobs in an S3-compatible bucket (AWS S3, MinIO, ...).
+    Requires the ``s3`` extra (boto3). boto3 is blocking, so every call
+    runs in the thread pool.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+    ):
+        if boto3 is None:
+            raise RuntimeError(
+                "STORAGE_BACKEND=s3 requires boto3: "
+                "install audio_manager with the 's3' extra"
+            )
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+        )
+
+    def locator(self, key: str) -> str:
+        return f"s3://{self.bucket}/{shard_key(key)}"
+
+    def _exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=shard_key(key))
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return False
+            raise
+        return True
+
+    async def exists(self, key: str) -> bool:
+        return await run_in_threadpool(self._exists, key)
+
+    def _save(self, key: str, source_path: str) -> bool:
+        try:
+            if self._exists(key):
+                return False
+            self.client.upload_file(source_path, self.bucket, shard_key(key))
+            return True
+        finally:
+            os.remove(source_path)
+
+    async def save(self, key: str, source_path: str) -> bool:
+        return await run_in_threadpool(self._save, key, source_path)
+
+    async def download(self, key: str, destination_path: str) -> None:
+        await run_in_threadpool(
+            self.client.download_file,
+            self.bucket,
+            shard_key(key),
+            destination_path,
+        )
+
+    def _read(self, key: str) -> bytes:
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket, Key=shard_key(key)
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                raise FileNotFoundError(key)
+            raise
+        return response["Body"].read()
+
+    async def read(self, key: str) -> bytes:
+        return await run_in_threadpool(self._read, key)
+
+    async def delete(self, key: str) -> None:
+        await run_in_threadpool(
+            self.client.delete_object, Bucket=self.bucket, Key=shard_key(key)
+        )
+
+    def _delete_many(self, keys: list[str]) -> None:
+        for start in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+            end = start + S3_DELETE_BATCH_SIZE
+            batch = keys[start:end]
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={
+                    "Objects": [{"Key": shard_key(key)} for key in batch],
+                    "Quiet": True,
+                },
+            )
+
+    async def delete_many(self, keys: list[str]) -> None:
+        await run_in_threadpool(self._delete_many, keys)
+
+    async def url(
+        self, key: str, filename: str, media_type: str | None
+    ) -> str | None:
+        params = {
+            "Bucket": self.bucket,
+            "Key": shard_key(key),
+            "ResponseContentDisposition": "inline; filename*=utf-8''"
+            + quote(filename),
+        }
+        if media_type:
+            params["ResponseContentType"] = media_type
+        return await run_in_threadpool(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params=params,
+            ExpiresIn=settings.S3_PRESIGNED_URL_EXPIRE_SECONDS,
+        )
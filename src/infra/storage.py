@@ -0,0 +1,154 @@
+import os
+import shutil
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from starlette.concurrency import run_in_threadpool
+
+from src.settings import settings
+
+BLOBS_DIRECTORY = "blobs"
+
+
+def shard_key(key: str) -> str:
+    """
+    Spreads keys over two levels of sub-directories (``ab/cd/abcd...``),
+    so no directory ends up with more than a few thousand entries.
+    Keys are content hashes, so their prefixes are uniformly distributed.
+    """
+    return "/".join((key[0:2], key[2:4], key))
+
+
+class StorageBackend(ABC):
+    """Stores audio blobs by key (the SHA-256 of their content)."""
+
+    @abstractmethod
+    def locator(self, key: str) -> str:
+        """Returns the location of ``key`` saved to the database."""
+
+    def local_path(self, key: str) -> str | None:
+        """Returns a local filesystem path of ``key``, if there is one."""
+        return None
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def save(self, key: str, source_path: str) -> bool:
+        """
+        Moves the local file ``source_path`` into storage under ``key``.
+        The source file is always consumed. Returns False if the key was
+        already stored.
+        """
+
+    @abstractmethod
+    async def download(self, key: str, destination_path: str) -> None:
+        """Copies ``key`` to the local file ``destination_path``."""
+
+    @abstractmethod
+    async def read(self, key: str) -> bytes:
+        """
+        Returns the content of a small object. Raises FileNotFoundError if
+        ``key`` is not stored.
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    async def delete_many(self, keys: list[str]) -> None:
+        """Deletes ``keys``; keys that are not stored are ignored."""
+        for key in keys:
+            await self.delete(key)
+
+    async def url(
+        self, key: str, filename: str, media_type: str | None
+    ) -> str | None:
+        """Returns a URL clients can fetch ``key`` from directly, if any."""
+        return None
+
+
+class LocalStorageBackend(StorageBackend):
+    """Stores blobs on the local filesystem in sharded sub-directories."""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def locator(self, key: str) -> str:
+        return os.path.join(self.root, shard_key(key))
+
+    def local_path(self, key: str) -> str:
+        return self.locator(key)
+
+    async def exists(self, key: str) -> bool:
+        return await run_in_threadpool(os.path.exists, self.locator(key))
+
+    @staticmethod
+    def _move(source_path: str, destination: str) -> bool:
+        if os.path.exists(destination):
+            os.remove(source_path)
+            return False
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        try:
+            os.replace(source_path, destination)
+        except OSError:
+            # source is on another filesystem
+            shutil.copyfile(source_path, destination + ".part")
+            os.replace(destination + ".part", destination)
+            os.remove(source_path)
+        return True
+
+    async def save(self, key: str, source_path: str) -> bool:
+        return await run_in_threadpool(
+            self._move, source_path, self.locator(key)
+        )
+
+    async def download(self, key: str, destination_path: str) -> None:
+        await run_in_threadpool(
+            shutil.copyfile, self.locator(key), destination_path
+        )
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    async def read(self, key: str) -> bytes:
+        return await run_in_threadpool(self._read, self.locator(key))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    async def delete(self, key: str) -> None:
+        await run_in_threadpool(self._remove, self.locator(key))
+
+    def _remove_many(self, keys: list[str]) -> None:
+        for key in keys:
+            self._remove(self.locator(key))
+
+    async def delete_many(self, keys: list[str]) -> None:
+        # one thread pool hop for the whole batch
+        await run_in_threadpool(self._remove_many, keys)
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    """Returns the storage backend selected by STORAGE_BACKEND."""
+    if settings.STORAGE_BACKEND == "s3":
+        from src.infra.s3_storage import S3StorageBackend
+
+        return S3StorageBackend(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+        )
+    return LocalStorageBackend(
+        os.path.join(settings.FILE_UPLOAD_DIRECTORY, BLOBS_DIRECTORY)
+    )
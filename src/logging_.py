@@ -1,10 +1,33 @@
+"""
+Logging configured from settings.
+
+Records are put on a queue by the calling thread and written by a
+listener thread, so request handlers never wait on I/O. Messages are
+only formatted by the listener: pass arguments to the logger
+(``logger.info("Deleted %s files", count)``) rather than f-strings.
+Repetitive messages are rate limited by template.
+"""
+
+import atexit
+import json
 import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
 from enum import StrEnum
+from logging.handlers import QueueHandler, QueueListener
 
+from src.settings import settings
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
 LOG_FORMAT_DEBUG = (
     "%(levelname)s:%(message)s:%(pathname)s:%(funcName)s:%(lineno)d"
 )
 
+_listener: QueueListener | None = None
+
 
 class LogLevels(StrEnum):
     info = "INFO"
@@ -13,20 +36,149 @@ class LogLevels(StrEnum):
     debug = "DEBUG"
 
 
-def configure_logging(log_level: str = LogLevels.error):
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
     """
-    Configures the logging settings for the application based
-    on the given log level.
+    Lets at most ``burst`` records with the same logger, level and message
+    template through per ``interval`` seconds. The first record after a
+    suppressed run reports how many were dropped.
     """
-    log_level = str(log_level).upper()
-    log_levels = [level.value for level in LogLevels]
 
+    def __init__(self, burst: int, interval: float):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        # template -> (window start, records in window, suppressed)
+        self._windows: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.burst <= 0:
+            return True
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                if len(self._windows) > 10_000:
+                    self._windows.clear()
+                if suppressed:
+                    record.msg = f"{record.msg} [suppressed {suppressed}]"
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that drops records when the queue is full instead of
+    blocking the caller, and defers formatting to the listener thread.
+    """
+
+    def __init__(self, queue_: queue.Queue):
+        super().__init__(queue_)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(log_level: str | None = None):
+    """
+    Configures the logging settings for the application: root level from
+    ``log_level`` or LOG_LEVEL, per-logger levels from LOG_LEVELS, text or
+    JSON output, queued writes and rate limiting.
+    """
+    global _listener
+    log_level = str(log_level or settings.LOG_LEVEL).upper()
+    log_levels = [level.value for level in LogLevels]
     if log_level not in log_levels:
-        logging.basicConfig(level=LogLevels.error)
-        return
+        log_level = LogLevels.error
 
-    if log_level == LogLevels.debug:
-        logging.basicConfig(level=log_level, format=LOG_FORMAT_DEBUG)
+    output = logging.StreamHandler()
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    elif log_level == LogLevels.debug:
+        output.setFormatter(logging.Formatter(LOG_FORMAT_DEBUG))
+    else:
+        output.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    _stop_listener()
+    handler = DroppingQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+    handler.addFilter(
+        RateLimitFilter(
+            burst=settings.LOG_RATE_LIMIT_BURST,
+            interval=settings.LOG_RATE_LIMIT_INTERVAL_SECONDS,
+        )
+    )
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(log_level)
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    _listener = QueueListener(handler.queue, output)
+    _listener.start()
+
+
+def _restart_listener_in_child() -> None:
+    """
+    Threads do not survive fork: a forked worker gets a queue and a
+    listener of its own, or its records would pile up unwritten.
+    """
+    global _listener
+    if _listener is None:
         return
+    fresh = queue.Queue(settings.LOG_QUEUE_SIZE)
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            handler.queue = fresh
+            for filter_ in handler.filters:
+                if isinstance(filter_, RateLimitFilter):
+                    # may have been held by another thread of the parent
+                    filter_._lock = threading.Lock()
+    _listener = QueueListener(fresh, *_listener.handlers)
+    _listener.start()
+
 
-    logging.basicConfig(level=log_level)
+# flush queued records on interpreter exit
+atexit.register(_stop_listener)
+os.register_at_fork(after_in_child=_restart_listener_in_child)
@@ -1,24 +1,78 @@
 import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
 
+from anyio import to_thread
 from fastapi import FastAPI
 
-from src.logging_ import LogLevels, configure_logging
+from src.audio.tasks import run_blob_collector, run_upload_session_janitor
+from src.auth import tokens
+from src.auth.hashing import password_hasher
+from src.infra.db_accessor import db_config
+from src.infra.http_client import close_http_client
+from src.infra.processes import shutdown_process_pool, warm_up_process_pool
+from src.logging_ import configure_logging
+from src.monitoring.metrics import STARTUP_DURATION, mark_process_dead
+from src.monitoring.middleware import MetricsMiddleware
+from src.monitoring.profiling import ProfilingMiddleware
 from src.pre_startup import create_superuser
 from src.routes import register_routes
+from src.settings import settings
 
-app = FastAPI(title="audio_manager", summary="API_v1")
+logger = logging.getLogger(__name__)
 
 
-@app.on_event("startup")
-async def startup():
-    asyncio.create_task(create_superuser(app))
+async def warm_up() -> None:
+    """
+    Does ahead of the first requests what they would otherwise pay for:
+    pool connections, process pool workers, and the libraries behind
+    logins and tokens.
+    """
+    await db_config.warm_up(settings.DB_POOL_WARMUP_CONNECTIONS)
+    await warm_up_process_pool()
+    password_hasher.warm_up()
+    tokens.warm_up()
 
 
-register_routes(app)
-configure_logging(LogLevels.debug)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    app.state.ready = False
+    to_thread.current_default_thread_limiter().total_tokens = (
+        settings.THREADPOOL_MAX_WORKERS
+    )
+    # a failure here aborts startup instead of being lost in a task
+    await warm_up()
+    await create_superuser(app)
+    background_tasks = [
+        asyncio.create_task(run_upload_session_janitor()),
+        asyncio.create_task(run_blob_collector()),
+    ]
+    app.state.startup_seconds = time.perf_counter() - started
+    STARTUP_DURATION.set(app.state.startup_seconds)
+    logger.info("Ready in %.0f ms", app.state.startup_seconds * 1000)
+    app.state.ready = True
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        for task in background_tasks:
+            task.cancel()
+        await close_http_client(app)
+        await db_config.dispose()
+        shutdown_process_pool()
+        password_hasher.shutdown()
+        mark_process_dead()
 
 
-if __name__ == "__main__":
-    import uvicorn
+app = FastAPI(title="audio_manager", summary="API_v1", lifespan=lifespan)
 
-    uvicorn.run("main:app", reload=True, port=8100)
+app.add_middleware(ProfilingMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(
+        MetricsMiddleware,
+        excluded_paths=("/metrics", "/health/live", "/health/ready"),
+    )
+register_routes(app)
+configure_logging()
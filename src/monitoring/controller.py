@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from src.monitoring.metrics import get_registry
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Exposes metrics in the Prometheus text format."""
+    return Response(
+        generate_latest(get_registry()), media_type=CONTENT_TYPE_LATEST
+    )
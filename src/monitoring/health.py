@@ -0,0 +1,36 @@
+import asyncio
+
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+
+from src.infra.db_accessor import db_config
+from src.settings import settings
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/live")
+async def live():
+    """The process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready(request: Request):
+    """
+    The worker has finished its startup warm-up and reaches the database;
+    route traffic to it only while this returns 200.
+    """
+    state = request.app.state
+    if not getattr(state, "ready", False):
+        return JSONResponse(
+            {"status": "starting"}, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    try:
+        async with asyncio.timeout(settings.HEALTH_CHECK_TIMEOUT_SECONDS):
+            await db_config.ping()
+    except Exception:
+        return JSONResponse(
+            {"status": "unavailable"}, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    return {"status": "ready", "startup_seconds": state.startup_seconds}
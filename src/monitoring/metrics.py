@@ -0,0 +1,160 @@
+"""
+Prometheus metrics.
+
+Under several worker processes, PROMETHEUS_MULTIPROC_DIR must be set in
+the environment of the server (an empty directory, cleared before
+start; ``python -m src`` takes care of it): every process then writes
+its samples to memory-mapped files there and /metrics aggregates them.
+"""
+
+import os
+import time
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    ["engine", "statement"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections checked out of the pool",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OPEN = Gauge(
+    "db_pool_open_connections",
+    "Connections opened by the pool, idle or in use",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to get a connection from the pool",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that timed out waiting for a connection",
+    ["engine"],
+)
+
+UPLOAD_BYTES = Counter(
+    "audio_upload_bytes_total", "Bytes of uploaded audio files"
+)
+UPLOADS = Counter("audio_uploads_total", "Uploaded audio files")
+UPLOAD_DURATION = Histogram(
+    "audio_upload_duration_seconds",
+    "Time to receive and store an uploaded file",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt time per operation, excluding queueing",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+AUTH_THROTTLE = Counter(
+    "auth_throttle_total",
+    "Auth requests admitted or rejected by admission control",
+    ["result"],
+)
+
+STARTUP_DURATION = Gauge(
+    "app_startup_seconds",
+    "Time from the start of the lifespan until the worker was ready",
+    multiprocess_mode="max",
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by result", ["cache", "result"]
+)
+
+
+def get_registry() -> CollectorRegistry:
+    """Returns the registry to expose, aggregated over processes if needed."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def mark_process_dead() -> None:
+    """Drops the live gauges of this process, e.g. on worker shutdown."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Records statement timing and pool gauges of ``engine``."""
+    query_start = f"_query_start_{name}"
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    open_connections = DB_POOL_OPEN.labels(name)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, *args):
+        conn.info.setdefault(query_start, []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, *args):
+        started = conn.info[query_start].pop()
+        kind = statement.lstrip().split(None, 1)[0].upper()
+        if kind not in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH"):
+            kind = "OTHER"
+        DB_QUERY_DURATION.labels(name, kind).observe(
+            time.perf_counter() - started
+        )
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None:
+            starts = context.connection.info.get(query_start)
+            if starts:
+                starts.pop()
+
+    @event.listens_for(engine.sync_engine.pool, "connect")
+    def connect(dbapi_connection, connection_record):
+        open_connections.inc()
+
+    @event.listens_for(engine.sync_engine.pool, "close")
+    def close(dbapi_connection, connection_record):
+        open_connections.dec()
+
+    @event.listens_for(engine.sync_engine.pool, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(engine.sync_engine.pool, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        checked_out.dec()
@@ -0,0 +1,47 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.monitoring.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and in-flight count of HTTP requests. A plain
+    ASGI middleware: it adds no task or stream wrapping per request.
+    Requests are labeled by route template, so labels stay bounded.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: tuple[str, ...] = ()):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            in_progress.dec()
+            route = scope.get("route")
+            path = route.path if route is not None else "<unmatched>"
+            HTTP_REQUEST_DURATION.labels(method, path).observe(duration)
+            HTTP_REQUESTS.labels(method, path, status).inc()
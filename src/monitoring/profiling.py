@@ -0,0 +1,212 @@
+"""
+Request profiling and SQL diagnostics.
+
+Always on:
+- statements slower than SLOW_QUERY_THRESHOLD_MS are logged;
+- a request that runs the same statement N_PLUS_ONE_THRESHOLD times or
+  more is logged as a likely N+1 query.
+
+On demand, for requests carrying PROFILING_HEADER with PROFILING_SECRET
+or picked with probability PROFILING_SAMPLE_RATE: a CPU profile of the
+request and every statement it ran (duration, row count) are written to
+PROFILING_DUMP_DIRECTORY. Profiles are taken with pyinstrument (the
+``profiling`` extra), one request at a time per worker: a profiler hooks
+the whole thread, so requests overlapping a profiled one only get their
+SQL recorded.
+"""
+
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestTrace:
+    """Statements run while handling one request."""
+
+    detailed: bool = False
+    counts: Counter = field(default_factory=Counter)
+    # (statement, duration in seconds, row count), when detailed
+    statements: list[tuple[str, float, int]] = field(default_factory=list)
+
+    def add(self, statement: str, duration: float, rowcount: int) -> None:
+        self.counts[statement] += 1
+        if self.detailed:
+            self.statements.append((statement, duration, rowcount))
+
+
+_current_trace: ContextVar[RequestTrace | None] = ContextVar(
+    "current_trace", default=None
+)
+
+
+def trace_queries(engine: AsyncEngine) -> None:
+    """Logs slow statements of ``engine`` and adds all to request traces."""
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, *args):
+        conn.info.setdefault("_trace_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, *args):
+        duration = time.perf_counter() - conn.info["_trace_start"].pop()
+        rowcount = cursor.rowcount
+        if threshold > 0 and duration >= threshold:
+            logger.warning(
+                "Slow query (%.1f ms, %s rows): %s",
+                duration * 1000,
+                rowcount,
+                statement,
+            )
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(statement, duration, rowcount)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None:
+            starts = context.connection.info.get("_trace_start")
+            if starts:
+                starts.pop()
+
+
+_profiler_active = False
+
+
+def _start_profiler():
+    """
+    Starts a pyinstrument profiler of the current task, unless one is
+    already running in this worker. Returns None if none was started.
+    """
+    global _profiler_active
+    if _profiler_active:
+        return None
+    # imported on first use: profiling is off for almost every request
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        logger.warning("Profiling requires pyinstrument")
+        return None
+    profiler = Profiler(
+        interval=settings.PROFILING_INTERVAL_SECONDS, async_mode="enabled"
+    )
+    try:
+        profiler.start()
+    except RuntimeError as e:
+        # another profiling tool holds the thread's profile hook
+        logger.warning("Failed to start the profiler: %s", e)
+        return None
+    _profiler_active = True
+    return profiler
+
+
+def _stop_profiler(profiler) -> None:
+    global _profiler_active
+    try:
+        profiler.stop()
+    finally:
+        _profiler_active = False
+
+
+def _write_dump(profiler, trace: RequestTrace, summary: dict) -> str:
+    directory = settings.PROFILING_DUMP_DIRECTORY
+    os.makedirs(directory, exist_ok=True)
+    route = re.sub(r"[^A-Za-z0-9]+", "_", summary["route"]).strip("_")
+    base = os.path.join(
+        directory,
+        f"{time.strftime('%Y%m%dT%H%M%S')}-{summary['method']}-"
+        f"{route or 'root'}-{uuid.uuid4().hex[:8]}",
+    )
+    with open(f"{base}.html", "w") as f:
+        f.write(profiler.output_html())
+    summary["queries"] = [
+        {"statement": statement, "ms": duration * 1000, "rows": rowcount}
+        for statement, duration, rowcount in trace.statements
+    ]
+    with open(f"{base}.json", "w") as f:
+        json.dump(summary, f, indent=2)
+    return base
+
+
+class ProfilingMiddleware:
+    """Traces the SQL of every request and profiles the selected ones."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.header = settings.PROFILING_HEADER.lower()
+
+    def _should_profile(self, scope: Scope) -> bool:
+        secret = settings.PROFILING_SECRET
+        if secret:
+            value = Headers(scope=scope).get(self.header)
+            if value is not None and hmac.compare_digest(value, secret):
+                return True
+        rate = settings.PROFILING_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trace = RequestTrace(detailed=self._should_profile(scope))
+        token = _current_trace.set(trace)
+        profiler = None
+        started = time.perf_counter()
+        try:
+            if trace.detailed:
+                profiler = _start_profiler()
+                trace.detailed = profiler is not None
+            await self.app(scope, receive, send)
+        finally:
+            duration = time.perf_counter() - started
+            _current_trace.reset(token)
+            if profiler is not None:
+                _stop_profiler(profiler)
+            route = scope.get("route")
+            path = route.path if route is not None else scope["path"]
+            self._check_repeated(trace, scope["method"], path)
+            if profiler is not None:
+                summary = {
+                    "method": scope["method"],
+                    "route": path,
+                    "path": scope["path"],
+                    "ms": duration * 1000,
+                }
+                base = await run_in_threadpool(
+                    _write_dump, profiler, trace, summary
+                )
+                logger.info("Profiled %s %s: %s", scope["method"], path, base)
+
+    @staticmethod
+    def _check_repeated(trace: RequestTrace, method: str, path: str) -> None:
+        threshold = settings.N_PLUS_ONE_THRESHOLD
+        if threshold <= 0 or not trace.counts:
+            return
+        statement, count = trace.counts.most_common(1)[0]
+        if count >= threshold:
+            logger.warning(
+                "Possible N+1 query in %s %s: statement ran %s times: %s",
+                method,
+                path,
+                count,
+                statement,
+            )
@@ -1,12 +1,17 @@
 import logging
 
 from fastapi import FastAPI
-from sqlalchemy import select
+from sqlalchemy import func, select
 
+from src.auth.hashing import password_hasher
 from src.infra.db_accessor import db_config
 from src.settings import settings
 from src.users.models import Roles, UserProfile
-from src.users.service import bcrypt_context
+
+logger = logging.getLogger(__name__)
+
+# key of the Postgres advisory lock serializing bootstrap across workers
+BOOTSTRAP_LOCK_ID = 0x617564696F  # b"audio"
 
 
 async def create_superuser(app: FastAPI):
@@ -14,25 +19,36 @@ async def create_superuser(app: FastAPI):
     Creates a superuser if one does not exist. This function checks if
     a superuser exists by querying the database. If not, it creates a new
     superuser with the credentials provided in the settings.
+
+    Every worker runs this at startup; a transaction-level advisory lock
+    makes them take turns, so exactly one creates the superuser and the
+    others find it.
     """
     async with db_config.AsyncSession_() as session:
+        await session.execute(
+            select(func.pg_advisory_xact_lock(BOOTSTRAP_LOCK_ID))
+        )
         superuser = await session.execute(
             select(UserProfile).where(UserProfile.role == Roles.SUPERUSER)
         )
         superuser = superuser.scalars().first()
         if superuser:
-            logging.warning(f"Superuser exists: '{superuser.email}'")
+            logger.warning("Superuser exists: '%s'", superuser.email)
             return
         else:
             new_superuser = UserProfile(
                 email=settings.SUPERUSER_EMAIL,
                 username=settings.SUPERUSER_USERNAME,
-                password_hash=bcrypt_context.hash(settings.SUPERUSER_PASSWORD),
+                password_hash=await password_hasher.hash(
+                    settings.SUPERUSER_PASSWORD
+                ),
                 role=Roles.SUPERUSER,
             )
             session.add(new_superuser)
             await session.commit()
             await session.refresh(new_superuser)
-            logging.info(
-                f"Superuser created. email: '{new_superuser.email}', username: '{new_superuser.username}'"  # noqa E501
+            logger.info(
+                "Superuser created. email: '%s', username: '%s'",
+                new_superuser.email,
+                new_superuser.username,
             )
@@ -2,6 +2,9 @@ from fastapi import FastAPI
 
 from src.audio.controller import router as audio_router
 from src.auth.controller import router as auth_router
+from src.monitoring.controller import router as monitoring_router
+from src.monitoring.health import router as health_router
+from src.settings import settings
 from src.users.controller import router as users_router
 
 
@@ -10,3 +13,6 @@ def register_routes(app: FastAPI):
     app.include_router(auth_router)
     app.include_router(audio_router)
     app.include_router(users_router)
+    app.include_router(health_router)
+    if settings.METRICS_ENABLED:
+        app.include_router(monitoring_router)
@@ -15,6 +15,33 @@ class Settings(BaseSettings):
         env_file="./.env", env_ignore_empty=True, extra="ignore"
     )
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
+
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 8100
+    WEB_CONCURRENCY: int = 1
+    SERVER_RELOAD: bool = False
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    SERVER_KEEP_ALIVE_SECONDS: int = 5
+    SERVER_MAX_REQUESTS: int | None = None
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: dict[str, str] = {}
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    LOG_QUEUE_SIZE: int = 10_000
+    LOG_RATE_LIMIT_BURST: int = 20
+    LOG_RATE_LIMIT_INTERVAL_SECONDS: float = 60
+
+    METRICS_ENABLED: bool = True
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2
+
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    N_PLUS_ONE_THRESHOLD: int = 10
+    PROFILING_SAMPLE_RATE: float = 0
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_SECRET: str | None = None
+    PROFILING_INTERVAL_SECONDS: float = 0.001
+    PROFILING_DUMP_DIRECTORY: str = "./profiles"
     SECRET_KEY: str
 
     POSTGRES_DB: str
@@ -22,15 +49,79 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_HOST: str
     POSTGRES_PORT: int
+    POSTGRES_REPLICA_HOST: str | None = None
+    POSTGRES_REPLICA_PORT: int | None = None
+
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_POOL_WARMUP_CONNECTIONS: int = 5
 
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     ALGORITHM: str
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+
+    THROTTLE_BACKEND: Literal["memory", "redis"] = "memory"
+    THROTTLE_MAX_KEYS: int = 100_000
+    AUTH_IP_RATE: float = 5
+    AUTH_IP_BURST: int = 50
+    LOGIN_EMAIL_RATE: float = 0.2
+    LOGIN_EMAIL_BURST: int = 5
+    LOGIN_MAX_CONCURRENT: int = 8
+
+    USER_CACHE_BACKEND: Literal["memory", "redis"] = "memory"
+    USER_CACHE_TTL_SECONDS: float = 300
+    USER_CACHE_MAX_SIZE: int = 10_000
+
+    REDIS_URL: str | None = None
+    REDIS_TIMEOUT_SECONDS: float = 1
 
     SUPERUSER_EMAIL: EmailStr
     SUPERUSER_USERNAME: str
     SUPERUSER_PASSWORD: str
 
     FILE_UPLOAD_DIRECTORY: str
+    FILE_UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    FILE_UPLOAD_MAX_SIZE: int = 2 * 1024 * 1024 * 1024
+
+    STORAGE_BACKEND: Literal["local", "s3"] = "local"
+    S3_BUCKET: str | None = None
+    S3_ENDPOINT_URL: str | None = None
+    S3_REGION: str | None = None
+    S3_ACCESS_KEY_ID: str | None = None
+    S3_SECRET_ACCESS_KEY: str | None = None
+    S3_PRESIGNED_URL_EXPIRE_SECONDS: int = 3600
+
+    PROCESS_POOL_WORKERS: int = 2
+    PEAKS_RESOLUTIONS: list[int] = [256, 1024, 4096]
+
+    FILE_DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024
+    FILE_DOWNLOAD_ACCEL_REDIRECT_PREFIX: str | None = None
+    THREADPOOL_MAX_WORKERS: int = 100
+
+    BLOB_GC_INTERVAL_SECONDS: int = 300
+    BLOB_GC_BATCH_SIZE: int = 500
+    BLOB_GC_MAX_DELETES_PER_SECOND: float = 200
+
+    BATCH_UPLOAD_MAX_FILES: int = 500
+    BATCH_UPLOAD_CONCURRENCY: int = 8
+
+    UPLOAD_SESSION_CHUNK_SIZE: int = 8 * 1024 * 1024
+    UPLOAD_SESSION_MAX_CHUNK_SIZE: int = 64 * 1024 * 1024
+    UPLOAD_SESSION_TTL_MINUTES: int = 24 * 60
+    UPLOAD_SESSION_CLEANUP_INTERVAL_SECONDS: int = 600
+
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 10
+    HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS: float = 5
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 30
 
     YANDEX_CLIENT_ID: str
     YANDEX_SECRET_KEY: str
@@ -0,0 +1,129 @@
+"""
+Cache of user lookups by ID.
+
+Entries are UserResponseSchema snapshots (never the password hash), kept
+for USER_CACHE_TTL_SECONDS, replaced by UserService when a user is
+updated and dropped when one is deleted. With several workers, the
+in-process backend only sees its own invalidations, so other workers
+may serve a changed user until the entry expires; the Redis backend is
+shared and has no such lag.
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from src.infra.cache import TTLCache
+from src.infra.redis_client import get_redis
+from src.monitoring.metrics import CACHE_REQUESTS
+from src.settings import settings
+from src.users.schemas import UserResponseSchema
+
+logger = logging.getLogger(__name__)
+
+
+class UserCache(ABC):
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    async def get(self, user_id: int) -> UserResponseSchema | None:
+        pass
+
+    @abstractmethod
+    async def set(self, user: UserResponseSchema) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, user_id: int) -> None:
+        pass
+
+    async def replace(self, user: UserResponseSchema) -> None:
+        """Stores a user after a write; unlike set, errors are raised."""
+        await self.set(user)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class InMemoryUserCache(UserCache):
+    """LRU cache of one process, bounded to ``max_size`` users."""
+
+    def __init__(self, ttl: float, max_size: int):
+        super().__init__(ttl)
+        self._cache = TTLCache(max_size=max_size, name="user")
+
+    async def get(self, user_id: int) -> UserResponseSchema | None:
+        user = self._cache.get(user_id)
+        self.hits, self.misses = self._cache.hits, self._cache.misses
+        return user
+
+    async def set(self, user: UserResponseSchema) -> None:
+        self._cache.set(user.id, user, expires_at=time.time() + self.ttl)
+
+    async def delete(self, user_id: int) -> None:
+        self._cache.delete(user_id)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self._cache)}
+
+
+class RedisUserCache(UserCache):
+    """
+    Cache shared by all workers. Redis errors on reads and on read-through
+    fills are logged and treated as misses, so the database stays the
+    fallback; errors on writes after an update or delete are raised.
+    """
+
+    def __init__(self, redis, ttl: float, prefix: str = "user:"):
+        super().__init__(ttl)
+        self.redis = redis
+        self.prefix = prefix
+
+    async def get(self, user_id: int) -> UserResponseSchema | None:
+        try:
+            data = await self.redis.get(f"{self.prefix}{user_id}")
+        except Exception as e:
+            logger.error("User cache unavailable. Error: %s", e)
+            data = None
+        if data is None:
+            self.misses += 1
+            CACHE_REQUESTS.labels("user", "miss").inc()
+            return None
+        self.hits += 1
+        CACHE_REQUESTS.labels("user", "hit").inc()
+        return UserResponseSchema.model_validate_json(data)
+
+    async def set(self, user: UserResponseSchema) -> None:
+        try:
+            await self.replace(user)
+        except Exception as e:
+            logger.error("User cache unavailable. Error: %s", e)
+
+    async def replace(self, user: UserResponseSchema) -> None:
+        # like delete, a failed write must fail the update, or the old
+        # entry would be served until it expires
+        await self.redis.set(
+            f"{self.prefix}{user.id}",
+            user.model_dump_json(),
+            px=int(self.ttl * 1000),
+        )
+
+    async def delete(self, user_id: int) -> None:
+        # a failed invalidation must fail the write, or the entry would
+        # stay stale until it expires
+        await self.redis.delete(f"{self.prefix}{user_id}")
+
+
+@lru_cache
+def get_user_cache() -> UserCache:
+    """Returns the user cache selected by USER_CACHE_BACKEND."""
+    if settings.USER_CACHE_BACKEND == "redis":
+        return RedisUserCache(get_redis(), ttl=settings.USER_CACHE_TTL_SECONDS)
+    return InMemoryUserCache(
+        ttl=settings.USER_CACHE_TTL_SECONDS,
+        max_size=settings.USER_CACHE_MAX_SIZE,
+    )
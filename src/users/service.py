@@ -1,11 +1,12 @@
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from passlib.context import CryptContext
 from sqlalchemy import delete, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.auth.hashing import password_hasher
 from src.exceptions import UserAlreadyExists, UserNotFoundError
+from src.users.cache import UserCache, get_user_cache
 from src.users.models import UserProfile
 from src.users.schemas import (
     UserCreateSchema,
@@ -13,12 +14,15 @@ from src.users.schemas import (
     UserUpdateSchema,
 )
 
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class UserService:
     db_session: AsyncSession
+    # reads that tolerate replication lag; db_session if not set
+    read_session: AsyncSession | None = None
+    cache: UserCache = field(default_factory=get_user_cache)
     # auth_service: AuthService
 
     async def _check_unique_user(self, email, username):
@@ -31,8 +35,8 @@ class UserService:
             )
         )
         if existing_user:
-            logging.warning(
-                f"Attempted to create existing user: " f"{email} {username}"
+            logger.warning(
+                "Attempted to create existing user: %s %s", email, username
             )
             raise UserAlreadyExists(email=email, username=username)
 
@@ -44,7 +48,7 @@ class UserService:
             exclude_none=True, exclude={"password"}
         )
         if user_create.password:
-            user_create_data["password_hash"] = bcrypt_context.hash(
+            user_create_data["password_hash"] = await password_hasher.hash(
                 user_create.password
             )
         try:
@@ -56,22 +60,42 @@ class UserService:
             await self.db_session.commit()
         except Exception as e:
             await self.db_session.rollback()
-            logging.error(
-                f"Failed to create user: {user_create.email}. "
-                f"Error: {str(e)}"
+            logger.error(
+                "Failed to create user: %s. Error: %s", user_create.email, e
             )
             raise
         user_create_data["id"] = res.scalar()
         return UserResponseSchema(**user_create_data)
 
-    async def get_user_by_id(self, user_id: int) -> UserProfile:
-        user = await self.db_session.scalar(
+    async def get_user_by_id(
+        self, user_id: int, session: AsyncSession | None = None
+    ) -> UserProfile:
+        """
+        Returns the user ``user_id``. Cache hits are detached UserProfile
+        instances without password_hash: use them for reading only.
+        Misses read ``session``, by default the replica; checks guarding
+        writes pass the primary, which sees users registered a moment ago.
+        """
+        cached = await self.cache.get(user_id)
+        if cached is not None:
+            return UserProfile(**cached.model_dump())
+        user = await self._load_user(user_id, session or self.read_session)
+        await self.cache.set(
+            UserResponseSchema.model_validate(user, from_attributes=True)
+        )
+        return user
+
+    async def _load_user(
+        self, user_id: int, session: AsyncSession | None = None
+    ) -> UserProfile:
+        session = session or self.db_session
+        user = await session.scalar(
             select(UserProfile).where(UserProfile.id == user_id)
         )
         if not user:
-            logging.warning(f"User not found with ID: {user_id}")
+            logger.warning("User not found with ID: %s", user_id)
             raise UserNotFoundError(user_id)
-        logging.info(f"Successfully retrieved user with ID: {user_id}")
+        logger.debug("Successfully retrieved user with ID: %s", user_id)
         return user
 
     async def get_user_by_email(self, email: str) -> UserProfile:
@@ -81,15 +105,15 @@ class UserService:
         # TODO: рефактор
         if not user:
             return None
-        #     logging.warning(f"User not found with email: {email}")
+        #     logger.warning("User not found with email: %s", email)
         #     raise UserNotFoundError(email)
-        logging.info(f"Successfully retrieved user with email: {email}")
+        logger.debug("Successfully retrieved user with email: %s", email)
         return user
 
     async def update_user(
         self, user_update: UserUpdateSchema, user_id: int
     ) -> UserResponseSchema:
-        user = await self.get_user_by_id(user_id)
+        user = await self._load_user(user_id)
         user_update_data = user_update.model_dump(
             exclude_none=True,
         )
@@ -99,27 +123,29 @@ class UserService:
             await self.db_session.commit()
         except Exception as e:
             await self.db_session.rollback()
-            logging.error(
-                f"Failed to update user: {user.email}. " f"Error: {str(e)}"
-            )
+            logger.error("Failed to update user: %s. Error: %s", user.email, e)
             raise
+        # store the new profile rather than dropping the entry: a miss
+        # would be refilled from the replica, which may still be stale
+        await self.cache.replace(
+            UserResponseSchema.model_validate(user, from_attributes=True)
+        )
         return user
 
     async def delete_user(self, user_id: int) -> None:
-        user = await self.get_user_by_id(user_id)
+        user = await self._load_user(user_id)
         try:
             res = await self.db_session.execute(
                 delete(UserProfile).where(UserProfile.id == user_id)
             )
             await self.db_session.commit()
             if res.rowcount == 0:
-                logging.error(
-                    f"User '{user_id}' was not deleted. res.rowcount != 0"
+                logger.error(
+                    "User '%s' was not deleted. res.rowcount != 0", user_id
                 )
                 raise ValueError()
         except Exception as e:
             await self.db_session.rollback()
-            logging.error(
-                f"Failed to delete user: {user.email}. " f"Error: {str(e)}"
-            )
+            logger.error("Failed to delete user: %s. Error: %s", user.email, e)
             raise
+        await self.cache.delete(user_id)
@@ -0,0 +1,147 @@
+import struct
+
+import pytest
+
+from src.audio.metadata import AudioMetadata, extract_metadata
+
+
+def wav(channels=2, sample_rate=44100, bits=16, frames=100):
+    block_align = channels * bits // 8
+    fmt = struct.pack(
+        "<HHIIHH",
+        1,
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        bits,
+    )
+    data = bytes(frames * block_align)
+    body = (
+        b"WAVE"
+        + b"fmt "
+        + struct.pack("<I", len(fmt))
+        + fmt
+        + b"data"
+        + struct.pack("<I", len(data))
+        + data
+    )
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def flac(sample_rate=44100, channels=2, total_samples=44100):
+    packed = (
+        sample_rate << 44 | (channels - 1) << 41 | 15 << 36 | total_samples
+    )
+    info = bytes(10) + packed.to_bytes(8, "big") + bytes(16)
+    return b"fLaC" + b"\x80\x00\x00\x22" + info + bytes(100)
+
+
+def mp3(frames=10):
+    # MPEG 1 layer III, 128 kbps, 44.1 kHz, stereo; 417 bytes per frame
+    return (b"\xff\xfb\x90\x00" + bytes(413)) * frames
+
+
+def ogg_page(packet, granule=0):
+    return (
+        b"OggS"
+        + struct.pack("<BBqIIIB", 0, 0, granule, 1, 0, 0, 1)
+        + bytes([len(packet)])
+        + packet
+    )
+
+
+def vorbis(channels=2, sample_rate=44100, granule=44100):
+    identification = (
+        b"\x01vorbis"
+        + struct.pack("<IBIiii", 0, channels, sample_rate, 0, 128000, 0)
+        + b"\xb8\x01"
+    )
+    return ogg_page(identification) + ogg_page(b"\x00", granule)
+
+
+def opus(channels=2, granule=48312):
+    head = b"OpusHead" + struct.pack("<BBHIhB", 1, channels, 312, 0, 0, 0)
+    return ogg_page(head) + ogg_page(b"\x00", granule)
+
+
+VALID = {
+    "wav": wav(),
+    "flac": flac(),
+    "mp3": mp3(),
+    "ogg": vorbis(),
+}
+
+
+@pytest.fixture
+def parse(tmp_path):
+    def parse(content: bytes, extension: str) -> AudioMetadata:
+        path = tmp_path / f"audio.{extension}"
+        path.write_bytes(content)
+        return extract_metadata(str(path), extension)
+
+    return parse
+
+
+@pytest.mark.parametrize(
+    "extension, content, expected",
+    [
+        ("wav", wav(), AudioMetadata(100 / 44100, 1411200, 44100, 2, 444)),
+        ("flac", flac(), AudioMetadata(1.0, 1136, 44100, 2, 142)),
+        (
+            "mp3",
+            mp3(),
+            AudioMetadata(4170 * 8 / 128000, 128000, 44100, 2, 4170),
+        ),
+        ("ogg", vorbis(), AudioMetadata(1.0, 128000, 44100, 2, 87)),
+        # no input sample rate: Opus decodes at 48 kHz
+        ("ogg", opus(), AudioMetadata(1.0, 608, 48000, 2, 76)),
+    ],
+    ids=["wav", "flac", "mp3", "vorbis", "opus"],
+)
+def test_valid_headers(parse, extension, content, expected):
+    assert parse(content, extension) == expected
+
+
+@pytest.mark.parametrize("extension", VALID)
+def test_truncated_headers(parse, extension):
+    content = VALID[extension]
+    for length in range(len(content)):
+        metadata = parse(content[:length], extension)
+        assert metadata.size == length
+
+
+@pytest.mark.parametrize(
+    "extension, content",
+    [
+        ("wav", wav(channels=0)),
+        ("wav", wav(sample_rate=0)),
+        ("wav", wav(bits=0)),
+        ("flac", flac(sample_rate=0)),
+        ("flac", flac(total_samples=0)),
+        ("ogg", vorbis(sample_rate=0)),
+        ("ogg", vorbis(channels=0)),
+        ("ogg", vorbis(granule=0)),
+        ("ogg", opus(granule=0)),
+    ],
+    ids=[
+        "wav-channels",
+        "wav-sample-rate",
+        "wav-bits",
+        "flac-sample-rate",
+        "flac-samples",
+        "vorbis-sample-rate",
+        "vorbis-channels",
+        "vorbis-granule",
+        "opus-granule",
+    ],
+)
+def test_zeroed_headers(parse, extension, content):
+    metadata = parse(content, extension)
+    assert metadata.size == len(content)
+    assert metadata.duration is None
+
+
+@pytest.mark.parametrize("extension", VALID)
+def test_zeroed_files(parse, extension):
+    assert parse(bytes(256), extension) == AudioMetadata(size=256)
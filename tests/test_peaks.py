@@ -0,0 +1,102 @@
+import struct
+
+import pytest
+
+from src.audio.peaks import (
+    WAVE_FORMAT_EXTENSIBLE,
+    WAVE_FORMAT_IEEE_FLOAT,
+    WAVE_FORMAT_PCM,
+    compute_peaks,
+    read_level,
+)
+
+
+def wav(
+    samples: bytes,
+    format_tag=WAVE_FORMAT_PCM,
+    channels=1,
+    bits=16,
+    block_align=None,
+    fmt_size=16,
+):
+    if block_align is None:
+        block_align = channels * bits // 8
+    fmt = struct.pack(
+        "<HHIIHH",
+        format_tag,
+        channels,
+        8000,
+        8000 * block_align,
+        block_align,
+        bits,
+    )
+    fmt = fmt.ljust(fmt_size, b"\x00")[:fmt_size]
+    body = (
+        b"WAVE"
+        + b"fmt "
+        + struct.pack("<I", len(fmt))
+        + fmt
+        + b"data"
+        + struct.pack("<I", len(samples))
+        + samples
+    )
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+@pytest.fixture
+def peaks(tmp_path):
+    def peaks(content: bytes, resolution: int = 4) -> bytes:
+        path = tmp_path / "audio.wav"
+        path.write_bytes(content)
+        return read_level(
+            compute_peaks(str(path), "wav", None, [resolution]), resolution
+        )
+
+    return peaks
+
+
+def test_pcm16(peaks):
+    half = 256 * 2
+    samples = struct.pack(f"<{half}h", *[16384] * half)
+    samples += struct.pack(f"<{half}h", *[-32768, 32767] * (half // 2))
+    assert peaks(wav(samples)) == struct.pack(
+        "<8b", 64, 64, 64, 64, -127, 127, -127, 127
+    )
+
+
+def test_float32_stereo(peaks):
+    samples = struct.pack("<4f", -0.5, 0.25, 0.5, -0.25)
+    content = wav(samples, WAVE_FORMAT_IEEE_FLOAT, channels=2, bits=32)
+    assert peaks(content, 1) == struct.pack("<2b", -64, 64)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        wav(bytes(64), block_align=0),
+        wav(bytes(64), channels=0),
+        wav(bytes(64), bits=20),
+        wav(bytes(64), bits=64),
+        wav(bytes(64), WAVE_FORMAT_IEEE_FLOAT, bits=16),
+        wav(bytes(64), WAVE_FORMAT_EXTENSIBLE, fmt_size=18),
+        wav(bytes(64), fmt_size=12),
+        wav(b""),
+        b"RIFF\x00\x00\x00\x00WAVE",
+        bytes(64),
+    ],
+    ids=[
+        "zero-block-align",
+        "zero-channels",
+        "20-bit",
+        "64-bit-int",
+        "16-bit-float",
+        "truncated-extensible",
+        "truncated-fmt",
+        "no-samples",
+        "no-chunks",
+        "zeroed",
+    ],
+)
+def test_invalid_wav(peaks, content):
+    with pytest.raises(ValueError):
+        peaks(content)